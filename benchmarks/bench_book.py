@@ -0,0 +1,27 @@
+"""
+Benchmarks order book reconstruction throughput on synthetic events.
+
+Measured on one core with per-level order queues (1M events): about 160k
+events/s at sample_every=1 and 330-390k events/s at sample_every=10/100.
+This is below the 1M events/s target. The loop is pure Python, and NumPy
+level arrays would be slower there, because indexing them returns boxed
+scalars. Reaching the target would need a compiled loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_book
+"""
+import time
+from src.data.synthetic import generate_synthetic_lob
+from src.features.book import OrderBookReconstructor
+
+def main():
+    df = generate_synthetic_lob(n_events=1_000_000, vectorized=True, seed=42)
+    for sample_every in [1, 10, 100]:
+        reconstructor = OrderBookReconstructor(sample_every=sample_every)
+        start = time.perf_counter()
+        reconstructor.update(df)
+        elapsed = time.perf_counter() - start
+        print(f"sample_every={sample_every:>4} | {elapsed:6.3f}s | {len(df) / elapsed:12,.0f} events/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmarks the SimulationEngine replay loop (events/s) against the previous
+`DataFrame.iterrows` loop, with a TWAP strategy and limit orders resting on
+the book, on 1M and 10M synthetic events.
+
+The iterrows loop runs at a few tens of thousands of events/s, so it is
+timed on the first `legacy_events` events only and its rate reported.
+
+Run from the repository root:
+    python -m benchmarks.bench_engine
+"""
+import time
+from src.data.synthetic import SyntheticLOBGenerator
+from src.data.schema import timestamp_seconds, price_values
+from src.execution.strategies import TWAPStrategy
+from src.impact_models.parametric import AlmgrenChrissModel, ImpactParams
+from src.simulation.engine import SimulationEngine
+
+class IterrowsEngine(SimulationEngine):
+    """The replay loop as it was before the columnar rewrite."""
+
+    def _replay(self, data, strategy_step_func):
+        timestamps = timestamp_seconds(data)
+        prices = price_values(data)
+        for i, (_, event) in enumerate(data.iterrows()):
+            self.current_time = timestamps[i]
+            if event['event_type'] in [1, 4]:
+                self.current_price = prices[i]
+            if self.features is not None:
+                self.features.update(timestamps[i], event['event_type'], event['side'], prices[i], event['size'])
+            self._open_orders = list(self.active_orders) # Scan every order ever submitted, as before
+            self._match_limit_orders()
+            self._execute_market_orders()
+            strategy_step_func(self)
+
+def strategy(duration: float):
+    twap = TWAPStrategy(total_size=10_000, duration=duration, start_time=0.0, n_slices=100)
+
+    def step(engine):
+        twap.on_step(engine)
+        if engine.order_id_counter < 20: # Far-away limit orders that never fill
+            engine.submit_order(side=1, size=10, order_type='LIMIT', price=1.0)
+    return step
+
+def events_per_second(engine_cls, df, model) -> float:
+    engine = engine_cls(df, impact_model=model)
+    start = time.perf_counter()
+    engine.run(strategy(float(df['timestamp'].iloc[-1])))
+    return len(df) / (time.perf_counter() - start)
+
+def main(sizes=(1_000_000, 10_000_000), legacy_events=200_000):
+    model = AlmgrenChrissModel(ImpactParams(eta=0.1, gamma=0.01))
+    for n_events in sizes:
+        df = SyntheticLOBGenerator(seed=0).generate_lob_events(n_events, vectorized=True)
+        legacy = events_per_second(IterrowsEngine, df.iloc[:legacy_events], model)
+        columnar = events_per_second(SimulationEngine, df, model)
+        print(f"{n_events:>10,} events | iterrows {legacy:>10,.0f} ev/s (first {legacy_events:,})"
+              f" | columnar {columnar:>10,.0f} ev/s | {columnar / legacy:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmarks OFI/TFI throughput against the previous row-wise implementation,
+and the one-pass multi-horizon API against one call per window.
+
+Run from the repository root:
+    python -m benchmarks.bench_features [n_events ...]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.data.synthetic import generate_synthetic_lob
+from src.features.microstructure import MicrostructureFeatures
+from src.features.volatility import VolatilityFeatures
+from src.features.horizons import MultiHorizonFeatures
+
+WINDOWS = ['1s', '5s', '30s', '1min']
+
+def legacy_ofi_tfi(df: pd.DataFrame, time_window: str = '1s'):
+    """The apply/resample implementation the vectorized path replaced."""
+    df = df.copy()
+    df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
+    df.set_index('datetime', inplace=True)
+    df['signed_vol'] = df.apply(lambda x: x['size'] if x['event_type'] == 1 else -x['size'], axis=1)
+    df['bid_flow'] = np.where(df['side'] == 1, df['signed_vol'], 0)
+    df['ask_flow'] = np.where(df['side'] == -1, df['signed_vol'], 0)
+    ofi = df[['bid_flow', 'ask_flow']].resample(time_window).sum()
+    ofi['ofi'] = ofi['bid_flow'] - ofi['ask_flow']
+
+    trades = df[df['event_type'] == 4].copy()
+    trades['signed_vol'] = trades.apply(lambda x: x['size'] if x['side'] == 1 else -x['size'], axis=1)
+    tfi = trades[['signed_vol']].resample(time_window).sum().rename(columns={'signed_vol': 'tfi'})
+    return ofi, tfi
+
+def vectorized_ofi_tfi(df: pd.DataFrame, time_window: str = '1s'):
+    buckets = MicrostructureFeatures.bucket_index(df, time_window)
+    ofi = MicrostructureFeatures.calculate_ofi(df, buckets=buckets)
+    tfi = MicrostructureFeatures.calculate_tfi(df, buckets=buckets)
+    return ofi, tfi
+
+def per_window(df: pd.DataFrame):
+    for window in WINDOWS:
+        MicrostructureFeatures.calculate_ofi(df, window)
+        MicrostructureFeatures.calculate_tfi(df, window)
+        VolatilityFeatures.calculate_volume_profile(df, window)
+
+def multi_horizon(df: pd.DataFrame):
+    MultiHorizonFeatures.calculate(df, WINDOWS)
+
+def timed(func, df):
+    start = time.perf_counter()
+    func(df)
+    return time.perf_counter() - start
+
+def main(sizes=(1_000_000, 10_000_000), legacy_limit=1_000_000):
+    for n_events in sizes:
+        df = generate_synthetic_lob(n_events=n_events, vectorized=True, seed=42)
+        new = timed(vectorized_ofi_tfi, df)
+        line = f"{n_events:>11,} events | vectorized {new:7.3f}s ({n_events / new:13,.0f} events/s)"
+        if n_events <= legacy_limit:
+            old = timed(legacy_ofi_tfi, df)
+            line += f" | apply {old:7.3f}s ({n_events / old:11,.0f} events/s) | {old / new:6.1f}x"
+        print(line)
+        separate, combined = timed(per_window, df), timed(multi_horizon, df)
+        print(f"{'':>18} {len(WINDOWS)} windows | per-window calls {separate:7.3f}s | one pass {combined:7.3f}s")
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (1_000_000, 10_000_000))
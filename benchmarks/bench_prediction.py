@@ -0,0 +1,52 @@
+"""
+Benchmarks PricePredictor inference latency: sklearn predict_proba versus
+the compiled single-row and batch paths.
+
+Run from the repository root:
+    python -m benchmarks.bench_prediction
+"""
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from src.impact_models.prediction import PricePredictor
+
+def per_call(func, rows, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            func(row)
+        best = min(best, (time.perf_counter() - start) / len(rows))
+    return best
+
+def main(n_calls=20_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'ofi': rng.normal(size=10_000),
+        'tfi': rng.normal(size=10_000),
+        'price': 100 + np.cumsum(rng.choice([-1, 0, 1], size=10_000) * 0.01),
+    })
+    predictor = PricePredictor()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        predictor.train(df)
+
+    rows = rng.normal(size=(n_calls, 2))
+    sklearn_path = per_call(lambda row: predictor.predict_proba(row[None, :]), rows[:2000])
+    compiled = predictor.compile()
+    compiled_path = per_call(compiled.predict_row, rows)
+    print(f"single row | predict_proba {sklearn_path * 1e6:8.2f} us | compiled {compiled_path * 1e6:6.2f} us"
+          f" | {sklearn_path / compiled_path:5.1f}x")
+
+    batch = rng.normal(size=(1_000_000, 2))
+    start = time.perf_counter()
+    predictor.predict_proba(batch)
+    sklearn_batch = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled.predict_batch(batch)
+    compiled_batch = time.perf_counter() - start
+    print(f"1M rows    | predict_proba {sklearn_batch:8.3f} s  | compiled {compiled_batch:6.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmarks ImpactSurface lookups against exact model evaluation, per fill
+and batched, for a power-law model and a volatility-scaled model with a
+costlier impact function.
+
+The power-law model is not tabulated (the surface calls the closed form),
+so its rows should match the exact model. The surface pays off per fill
+for the vol-scaled model. For vectorized batches the exact model stays
+faster, because random gathers into a large grid cost more than a few
+ufuncs.
+
+Run from the repository root:
+    python -m benchmarks.bench_surface
+"""
+import time
+import numpy as np
+from scipy.special import erf
+from src.impact_models.parametric import AlmgrenChrissModel, ImpactParams
+from src.impact_models.surface import ImpactSurface
+
+class SaturatingVolModel(AlmgrenChrissModel):
+    """Square-root law scaled by volatility, saturating at large participation."""
+
+    def calculate_temporary_impact(self, rate, volatility):
+        rate, volatility = np.asarray(rate, dtype=float), np.asarray(volatility, dtype=float)
+        scaled = np.abs(rate) / (1e3 * volatility)
+        return np.sign(rate) * self.params.eta * volatility * np.sqrt(scaled) * erf(1.0 / (1.0 + np.log1p(scaled)))
+
+def per_call(func, n=50_000):
+    start = time.perf_counter()
+    for k in range(n):
+        func(100.0 + k % 500, 0.02)
+    return (time.perf_counter() - start) / n
+
+def main(n_batch=1_000_000):
+    rng = np.random.default_rng(0)
+    rates = np.exp(rng.uniform(0, 10, n_batch))
+    vols = np.exp(rng.uniform(np.log(0.005), np.log(0.5), n_batch))
+    params = ImpactParams(eta=0.1, gamma=0.01, alpha=0.5, beta=0.6)
+    for name, model in [('power law', AlmgrenChrissModel(params)), ('vol-scaled', SaturatingVolModel(params))]:
+        start = time.perf_counter()
+        surface = ImpactSurface(model, tolerance=1e-5)
+        build = time.perf_counter() - start
+        exact_fill = per_call(model.calculate_temporary_impact)
+        surface_fill = per_call(surface.calculate_temporary_impact)
+
+        start = time.perf_counter()
+        model.calculate_temporary_impact(rates, vols)
+        exact_batch = time.perf_counter() - start
+        start = time.perf_counter()
+        surface.calculate_temporary_impact(rates, vols)
+        surface_batch = time.perf_counter() - start
+        grid = 'exact' if surface.exact_temporary else surface.temp_table.shape
+        print(f"{name:>10} | grid {grid} built in {build:.3f}s, max error {surface.verify(seed=1):.1e}"
+              f" | per fill exact {exact_fill * 1e6:5.2f} us, surface {surface_fill * 1e6:5.2f} us"
+              f" | 1M batch exact {exact_batch:.3f}s, surface {surface_batch:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,3 @@
-from .synthetic import generate_synthetic_lob
+from .synthetic import generate_synthetic_lob, generate_synthetic_lob_chunks
+from .universe import generate_synthetic_universe
+from .hawkes import HawkesParams
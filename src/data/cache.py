@@ -0,0 +1,138 @@
+import gc
+import hashlib
+import json
+import os
+import shutil
+import warnings
+import pandas as pd
+from typing import List, Optional
+from .store import write_column_store, read_column_store, META_FILE
+
+SOURCE_FILE = 'source.json'
+
+class EventCache:
+    """
+    On-disk cache of normalized event data in the column store format.
+
+    Entries are keyed by a fingerprint of the source file (absolute path,
+    size, mtime) and the normalization version, so editing the file or
+    changing `normalize` never serves stale data. Hits are memory-mapped.
+
+    Eviction is least-recently-used: every hit touches the entry, and the
+    oldest entries are dropped whenever the total size exceeds `max_bytes`.
+    Putting a new version of a file also drops its outdated entries.
+
+    Column files that are still memory-mapped by live frames cannot be
+    deleted on Windows. Such entries stop being served, stay counted
+    against `max_bytes` and are retried on the next eviction, with a
+    `ResourceWarning` naming the files.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 10 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(filepath: str, version: int = 0) -> str:
+        """Cheap fingerprint from file metadata; does not read the file."""
+        stat = os.stat(filepath)
+        key = f"{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}|{version}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get(self, filepath: str, version: int = 0) -> Optional[pd.DataFrame]:
+        """Returns the cached frame (memory-mapped columns) or None."""
+        entry = self._entry(self.fingerprint(filepath, version))
+        if not os.path.exists(os.path.join(entry, META_FILE)):
+            return None
+        os.utime(os.path.join(entry, SOURCE_FILE))
+        return read_column_store(entry)
+
+    def put(self, filepath: str, df: pd.DataFrame, version: int = 0) -> pd.DataFrame:
+        """Stores `df` for `filepath` and returns the memory-mapped copy."""
+        self.invalidate(filepath)
+        key = self.fingerprint(filepath, version)
+        entry = self._entry(key)
+        tmp = entry + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        write_column_store([df], tmp)
+        with open(os.path.join(tmp, SOURCE_FILE), 'w') as f:
+            json.dump({'path': os.path.abspath(filepath), 'version': version}, f)
+        os.replace(tmp, entry)
+        self.evict(keep=key)
+        return read_column_store(entry)
+
+    def invalidate(self, filepath: str) -> int:
+        """Drops every entry (any version) of `filepath`. Returns the count."""
+        path = os.path.abspath(filepath)
+        removed = 0
+        for key in self._keys():
+            with open(os.path.join(self._entry(key), SOURCE_FILE)) as f:
+                source = json.load(f)
+            if source['path'] == path and self._remove(key):
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Removes all entries."""
+        for key in self._keys():
+            self._remove(key)
+
+    def size_bytes(self) -> int:
+        return sum(self._entry_size(key) for key in self._keys())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Drops least-recently-used entries until within `max_bytes`. Returns the count."""
+        keys = sorted(self._keys(), key=lambda k: os.path.getmtime(os.path.join(self._entry(k), SOURCE_FILE)))
+        sizes = {key: self._entry_size(key) for key in keys}
+        total = sum(sizes.values())
+        removed = 0
+        for key in keys:
+            if total <= self.max_bytes:
+                break
+            if key == keep or not self._remove(key):
+                continue
+            total -= sizes[key]
+            removed += 1
+        return removed
+
+    def _remove(self, key: str) -> bool:
+        """
+        Deletes an entry. The metadata goes first, so a partly deleted entry
+        is never served, and the source record last, so an entry whose
+        column files are still mapped keeps counting towards the size cap.
+        Returns False (with a ResourceWarning) if files could not be removed.
+        """
+        entry = self._entry(key)
+        gc.collect() # Unreachable frames may still hold maps of the column files
+        failed = []
+        names = [META_FILE] + [name for name in os.listdir(entry) if name not in (META_FILE, SOURCE_FILE)]
+        for name in names + [SOURCE_FILE]:
+            if failed and name == SOURCE_FILE:
+                break
+            try:
+                os.remove(os.path.join(entry, name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                failed.append(name)
+        if not failed:
+            try:
+                os.rmdir(entry)
+            except OSError:
+                failed.append(entry)
+        if failed:
+            warnings.warn(f"Cache entry {entry} not fully removed, files in use: {failed}", ResourceWarning)
+            return False
+        return True
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _keys(self) -> List[str]:
+        return [name for name in os.listdir(self.cache_dir)
+                if os.path.exists(os.path.join(self.cache_dir, name, SOURCE_FILE))]
+
+    def _entry_size(self, key: str) -> int:
+        entry = self._entry(key)
+        return sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
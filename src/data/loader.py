@@ -1,23 +1,137 @@
 import pandas as pd
 import numpy as np
-from typing import Union, List
+from typing import Union, List, Iterator, Iterable, Optional, Dict
+from .store import external_sort, write_sorted_column_store
+from .cache import EventCache
+from .schema import to_compact
+from .validation import ValidationReport
 
 class DataLoader:
     """
     Handles loading and normalization of LOB data.
     """
+
+    # Bump whenever `normalize` changes its output, to invalidate cached loads
+    NORMALIZATION_VERSION = 1
+
+    # Parse-time dtypes for the standard columns (extra columns are inferred)
+    CSV_DTYPES = {
+        'timestamp': 'float64',
+        'event_type': 'int64',
+        'side': 'int64',
+        'price': 'float64',
+        'size': 'float64',
+        'order_id': 'int64',
+        'symbol': 'object',
+    }
     
     @staticmethod
-    def load_from_csv(filepath: str) -> pd.DataFrame:
-        """Loads LOB data from a CSV file."""
+    def load_from_csv(filepath: str, cache: Optional[EventCache] = None) -> pd.DataFrame:
+        """
+        Loads LOB data from a CSV file.
+
+        With a `cache`, the normalized result is stored in columnar form and
+        later loads of the unchanged file return memory-mapped columns
+        (string columns as Categoricals) without parsing.
+        """
+        if cache is not None:
+            cached = cache.get(filepath, DataLoader.NORMALIZATION_VERSION)
+            if cached is not None:
+                return cached
+
         df = pd.read_csv(filepath)
-        return DataLoader.normalize(df)
+        df = DataLoader.normalize(df)
+
+        if cache is not None:
+            return cache.put(filepath, df, DataLoader.NORMALIZATION_VERSION)
+        return df
+
+    @staticmethod
+    def iter_csv(filepath: str, chunksize: int = 1_000_000,
+                 assume_sorted: Optional[bool] = None,
+                 tmp_dir: Optional[str] = None,
+                 report: Optional[ValidationReport] = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams a large CSV as normalized, time-ordered chunks.
+
+        Chunks are parsed with `CSV_DTYPES` and normalized in place. Sort
+        order is established by a timestamp-only pre-scan: sorted files are
+        streamed straight through, anything else goes through an external
+        merge sort spilled under `tmp_dir`.
+
+        Args:
+            filepath: CSV path.
+            chunksize: Rows per parsed chunk.
+            assume_sorted: Skip the pre-scan (True) or force the sort (False).
+            tmp_dir: Directory for external sort runs (system temp by default).
+            report: Optional `ValidationReport` updated with each yielded chunk.
+        """
+        if assume_sorted is None:
+            assume_sorted = DataLoader._csv_is_sorted(filepath, chunksize)
+
+        chunks = DataLoader._read_csv_chunks(filepath, chunksize)
+        if assume_sorted:
+            chunks = DataLoader._check_order(chunks)
+        else:
+            chunks = external_sort(chunks, key='timestamp', block_size=chunksize, tmp_dir=tmp_dir)
+        return report.track(chunks) if report is not None else chunks
+
+    @staticmethod
+    def csv_to_store(filepath: str, store_path: str, chunksize: int = 1_000_000) -> str:
+        """
+        Ingests a CSV into an on-disk column store (see `src.data.store`) in
+        one pass. Already-sorted input is written as-is; otherwise the spilled
+        chunks are merged into time order. Returns `store_path`.
+        """
+        chunks = DataLoader._read_csv_chunks(filepath, chunksize)
+        return write_sorted_column_store(chunks, store_path, key='timestamp', block_size=chunksize)
+
+    @staticmethod
+    def _read_csv_chunks(filepath: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        reader = pd.read_csv(filepath, dtype=DataLoader.CSV_DTYPES, chunksize=chunksize)
+        offset = 0
+        for chunk in reader:
+            chunk = DataLoader.normalize(chunk, sort=False)
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def _csv_is_sorted(filepath: str, chunksize: int) -> bool:
+        """Pre-scan of the timestamp column only."""
+        last = -np.inf
+        for chunk in pd.read_csv(filepath, usecols=['timestamp'], dtype={'timestamp': 'float64'}, chunksize=chunksize):
+            ts = chunk['timestamp'].to_numpy()
+            if len(ts) == 0:
+                continue
+            if ts[0] < last or (np.diff(ts) < 0).any():
+                return False
+            last = ts[-1]
+        return True
+
+    @staticmethod
+    def _check_order(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        last = -np.inf
+        for chunk in chunks:
+            ts = chunk['timestamp']
+            if len(ts) and (ts.iloc[0] < last or not ts.is_monotonic_increasing):
+                raise ValueError("Input is not sorted by timestamp (use assume_sorted=False)")
+            if len(ts):
+                last = ts.iloc[-1]
+            yield chunk
     
     @staticmethod
-    def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    def normalize(df: pd.DataFrame, sort: bool = True, compact: bool = False,
+                  tick_size: Union[float, Dict[str, float]] = 0.01) -> pd.DataFrame:
         """
         Normalizes column names and types.
         Expected columns: timestamp, event_type, side, price, size, order_id
+
+        Already-sorted frames skip the sort, and columns that already have
+        the target dtype are not copied. With `sort=False` the frame is
+        normalized in place. With `compact`, the result uses the compact
+        schema (int8 codes, integer price ticks of `tick_size`, nanosecond
+        timestamps; see `src.data.schema`).
         """
         # Ensure required columns exist
         required_cols = ['timestamp', 'event_type', 'side', 'price', 'size']
@@ -27,24 +141,32 @@ class DataLoader:
             pass
             
         # Sort by timestamp
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        if sort and not df['timestamp'].is_monotonic_increasing:
+            df = df.sort_values('timestamp').reset_index(drop=True)
+        elif sort:
+            df = df.reset_index(drop=True)
         
         # Ensure types
-        df['timestamp'] = df['timestamp'].astype(float)
-        df['event_type'] = df['event_type'].astype(int)
-        df['side'] = df['side'].astype(int)
-        df['price'] = df['price'].astype(float)
-        df['size'] = df['size'].astype(float)
-        
+        for col, dtype in [('timestamp', float), ('event_type', int), ('side', int), ('price', float), ('size', float)]:
+            if df[col].dtype != np.dtype(dtype):
+                df[col] = df[col].astype(dtype)
+
+        if compact:
+            return to_compact(df, tick_size)
         return df
 
     @staticmethod
-    def validate(df: pd.DataFrame) -> bool:
-        """Basic validation checks."""
-        if df.empty:
-            return False
-        if (df['price'] <= 0).any():
-            return False
-        if (df['size'] <= 0).any():
-            return False
-        return True
+    def validate(df: pd.DataFrame) -> ValidationReport:
+        """
+        Checks prices, sizes, timestamp order, event codes, sides and missing
+        values in one pass. The report is truthy when the data is valid.
+        """
+        return ValidationReport().update(df)
+
+    @staticmethod
+    def validate_chunks(chunks: Iterable[pd.DataFrame]) -> ValidationReport:
+        """Validates a chunked stream (e.g. `iter_csv`) in a single scan."""
+        report = ValidationReport()
+        for chunk in chunks:
+            report.update(chunk)
+        return report
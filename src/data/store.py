@@ -0,0 +1,336 @@
+import json
+import os
+import shutil
+import tempfile
+from urllib.parse import quote, unquote
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from .schema import SCHEMA_ATTRS
+
+META_FILE = 'meta.json'
+
+class ColumnStoreWriter:
+    """
+    Appends DataFrame chunks to an on-disk columnar store.
+
+    Layout: one raw little-endian binary file per column plus `meta.json`
+    with row count, dtypes and the categories of string columns (stored
+    as int32 codes). Numeric columns can be memory-mapped back with no copy.
+    Schema attributes (`SCHEMA_ATTRS`, e.g. the tick size of compact frames)
+    are kept in the metadata and restored on read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.n_rows = 0
+        self.dtypes: Dict[str, str] = {}
+        self.categories: Dict[str, Dict] = {}
+        self.attrs: Optional[Dict] = None
+        self._files = {}
+
+    def append(self, df: pd.DataFrame):
+        """Appends a chunk. Columns and dtypes must match the first chunk."""
+        if not self._files:
+            for col in df.columns:
+                self._files[col] = open(os.path.join(self.path, f"{col}.bin"), 'wb')
+        elif list(df.columns) != list(self._files):
+            raise ValueError("All chunks must have the same columns")
+
+        attrs = {key: df.attrs[key] for key in SCHEMA_ATTRS if key in df.attrs}
+        if self.attrs is None:
+            self.attrs = attrs
+        elif attrs != self.attrs:
+            raise ValueError(f"Chunk schema attributes {attrs} differ from {self.attrs}")
+
+        for col in df.columns:
+            values = self._encode(col, df[col])
+            dtype = values.dtype.str
+            if self.dtypes.setdefault(col, dtype) != dtype:
+                raise ValueError(f"Column '{col}' changed dtype from {self.dtypes[col]} to {dtype}")
+            values.tofile(self._files[col])
+        self.n_rows += len(df)
+
+    def _encode(self, col: str, series: pd.Series) -> np.ndarray:
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+            mapping = self.categories.setdefault(col, {})
+            uniques, inverse = np.unique(series.astype(str).to_numpy(), return_inverse=True)
+            for value in uniques:
+                mapping.setdefault(value, len(mapping))
+            lookup = np.array([mapping[v] for v in uniques], dtype=np.int32)
+            return lookup[inverse.ravel()]
+        return np.ascontiguousarray(series.to_numpy()).astype(series.dtype.newbyteorder('<'), copy=False)
+
+    def close(self) -> str:
+        """Flushes all column files and writes the metadata."""
+        for f in self._files.values():
+            f.close()
+        meta = {
+            'n_rows': self.n_rows,
+            'columns': list(self._files),
+            'dtypes': self.dtypes,
+            'categories': {col: list(mapping) for col, mapping in self.categories.items()},
+            'attrs': self.attrs or {},
+        }
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(meta, f)
+        return self.path
+
+def write_column_store(chunks: Iterable[pd.DataFrame], path: str) -> str:
+    """Writes an iterable of chunks to a column store at `path`."""
+    writer = ColumnStoreWriter(path)
+    for chunk in chunks:
+        writer.append(chunk)
+    return writer.close()
+
+def read_store_meta(path: str) -> Dict:
+    with open(os.path.join(path, META_FILE)) as f:
+        return json.load(f)
+
+def read_column_store(path: str, columns: Optional[List[str]] = None, mmap: bool = True) -> pd.DataFrame:
+    """
+    Reads a column store. With `mmap`, numeric columns are read-only
+    memory-mapped views; string columns come back as Categoricals.
+    """
+    meta = read_store_meta(path)
+    n_rows = meta['n_rows']
+    data = {}
+    for col in columns or meta['columns']:
+        dtype = np.dtype(meta['dtypes'][col])
+        filename = os.path.join(path, f"{col}.bin")
+        if n_rows == 0:
+            values = np.empty(0, dtype=dtype)
+        elif mmap:
+            values = np.memmap(filename, dtype=dtype, mode='r', shape=(n_rows,))
+        else:
+            values = np.fromfile(filename, dtype=dtype)
+        if col in meta['categories']:
+            values = pd.Categorical.from_codes(values, categories=meta['categories'][col])
+        data[col] = values
+    df = pd.DataFrame(data, copy=False)
+    df.attrs.update(meta.get('attrs', {}))
+    return df
+
+def _decode(df: pd.DataFrame) -> pd.DataFrame:
+    """Turns store Categoricals back into plain object columns."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
+def _merge_runs(runs: pd.DataFrame, bounds: List[int], key: str, block_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Vectorized k-way merge of sorted runs `runs[bounds[r]:bounds[r + 1]]`.
+
+    Each round loads one block per run; every row up to the smallest
+    block-final key is safe to emit (no unread row can be smaller), so the
+    round is finished with one stable argsort over at most k blocks.
+
+    Ties keep run order: rows equal to the bound are only emitted from runs
+    up to the first one that limits it, since that run may still hold
+    unread rows with the same key.
+    """
+    keys = runs[key].to_numpy()
+    pos = list(bounds[:-1])
+    ends = bounds[1:]
+    while True:
+        active = [r for r in range(len(pos)) if pos[r] < ends[r]]
+        if not active:
+            return
+        stops = {r: min(pos[r] + block_size, ends[r]) for r in active}
+        # Runs fully loaded this round do not limit the bound
+        limits = {r: keys[stops[r] - 1] for r in active if stops[r] < ends[r]}
+        bound = min(limits.values()) if limits else np.inf
+        limiting = min((r for r, last in limits.items() if last == bound), default=len(pos))
+
+        indices = []
+        for r in active:
+            side = 'right' if r <= limiting else 'left'
+            take = pos[r] + np.searchsorted(keys[pos[r]:stops[r]], bound, side=side)
+            indices.append(np.arange(pos[r], take))
+            pos[r] = take
+        idx = np.concatenate(indices)
+        idx = idx[np.argsort(keys[idx], kind='stable')]
+        yield _decode(runs.iloc[idx].reset_index(drop=True))
+
+class _RunSpiller:
+    """Spills chunks as sorted runs and tracks whether they are in global order."""
+
+    def __init__(self, path: str, key: str):
+        self.writer = ColumnStoreWriter(path)
+        self.key = key
+        self.bounds = [0]
+        self.in_order = True
+        self._last = -np.inf
+
+    def append(self, chunk: pd.DataFrame):
+        if len(chunk) == 0:
+            return
+        if not chunk[self.key].is_monotonic_increasing:
+            chunk = chunk.sort_values(self.key, kind='mergesort')
+        self.in_order = self.in_order and chunk[self.key].iloc[0] >= self._last
+        self._last = chunk[self.key].iloc[-1]
+        self.writer.append(chunk)
+        self.bounds.append(self.writer.n_rows)
+
+    def close(self):
+        self.writer.close()
+
+    def finish(self, path: str, block_size: int) -> str:
+        """Turns the runs into a sorted store at `path` and removes the spill."""
+        self.close()
+        try:
+            if self.in_order:
+                shutil.rmtree(path, ignore_errors=True)
+                os.replace(self.writer.path, path)
+                return path
+            runs = read_column_store(self.writer.path)
+            return write_column_store(_merge_runs(runs, self.bounds, self.key, block_size), path)
+        finally:
+            shutil.rmtree(self.writer.path, ignore_errors=True)
+
+def external_sort(chunks: Iterable[pd.DataFrame], key: str = 'timestamp',
+                  block_size: int = 1_000_000, tmp_dir: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Sorts a stream of chunks that does not fit in memory.
+
+    Chunks are sorted in memory and spilled as runs to a temporary column
+    store, then merged block-wise. Peak memory is about one block per run.
+    The temporary files are removed when the iterator is exhausted or closed.
+    """
+    tmp = tempfile.mkdtemp(dir=tmp_dir)
+    try:
+        spiller = _RunSpiller(tmp, key)
+        for chunk in chunks:
+            spiller.append(chunk)
+        spiller.close()
+        if spiller.bounds[-1] == 0:
+            return
+        runs = read_column_store(tmp)
+        yield from _merge_runs(runs, spiller.bounds, key, block_size)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def write_sorted_column_store(chunks: Iterable[pd.DataFrame], path: str, key: str = 'timestamp',
+                              block_size: int = 1_000_000) -> str:
+    """
+    Writes chunks to a column store at `path`, ordered by `key`.
+
+    Input is spilled once next to `path`; when the chunks turn out to be in
+    global order that spill simply becomes the store, otherwise the runs are
+    merged into `path` (external merge sort).
+    """
+    tmp = path.rstrip(os.sep) + '.runs'
+    shutil.rmtree(tmp, ignore_errors=True)
+    spiller = _RunSpiller(tmp, key)
+    for chunk in chunks:
+        spiller.append(chunk)
+    return spiller.finish(path, block_size)
+
+def partition_name(symbol: str) -> str:
+    """
+    Directory name of a symbol's partition: percent-encoded, dots included,
+    so symbols such as 'BRK/B' or '..' cannot leave or reshape the store.
+    """
+    if symbol == '':
+        raise ValueError("Symbol must be non-empty")
+    return quote(symbol, safe='').replace('.', '%2E')
+
+class EventStore:
+    """
+    Time-indexed event store backed by memory-mapped column files.
+
+    Events are partitioned by symbol (one sorted column store per symbol
+    under `path`, named by `partition_name`) and each partition keeps a sparse index holding every
+    `INDEX_STRIDE`-th timestamp. A query binary-searches the sparse index,
+    then one stride of the mapped timestamps, so locating a window touches
+    O(log n) pages and single-symbol results are zero-copy views.
+    """
+
+    INDEX_STRIDE = 4096
+    INDEX_FILE = 'timestamp.idx.npy'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._partitions: Dict[str, pd.DataFrame] = {}
+        self._index: Dict[str, np.ndarray] = {}
+        for name in sorted(os.listdir(path)):
+            part = os.path.join(path, name)
+            if not os.path.exists(os.path.join(part, META_FILE)):
+                continue
+            symbol = unquote(name)
+            self._partitions[symbol] = read_column_store(part)
+            index_file = os.path.join(part, self.INDEX_FILE)
+            if os.path.exists(index_file):
+                self._index[symbol] = np.load(index_file)
+            else:
+                self._index[symbol] = np.asarray(self._partitions[symbol]['timestamp'].to_numpy()[::self.INDEX_STRIDE])
+
+    @classmethod
+    def build(cls, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], path: str,
+              block_size: int = 1_000_000) -> 'EventStore':
+        """
+        Writes events (a frame or an iterable of chunks) to a new store.
+        Out-of-order input is externally sorted per symbol.
+        """
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        os.makedirs(path, exist_ok=True)
+        spillers: Dict[str, _RunSpiller] = {}
+        for chunk in chunks:
+            for symbol, part in chunk.groupby('symbol', sort=False, observed=True):
+                symbol = str(symbol)
+                if symbol not in spillers:
+                    spillers[symbol] = _RunSpiller(os.path.join(path, partition_name(symbol) + '.runs'), 'timestamp')
+                spillers[symbol].append(part)
+
+        for symbol, spiller in spillers.items():
+            part_path = spiller.finish(os.path.join(path, partition_name(symbol)), block_size)
+            timestamps = read_column_store(part_path, columns=['timestamp'])['timestamp'].to_numpy()
+            np.save(os.path.join(part_path, cls.INDEX_FILE), np.asarray(timestamps[::cls.INDEX_STRIDE]))
+        return cls(path)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._partitions)
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self._partitions.values())
+
+    def _locate(self, symbol: str, value: float) -> int:
+        """First row of `symbol` with timestamp >= value."""
+        timestamps = self._partitions[symbol]['timestamp'].to_numpy()
+        block = int(np.searchsorted(self._index[symbol], value, side='left'))
+        if block == 0:
+            return 0
+        lo = (block - 1) * self.INDEX_STRIDE
+        hi = min(block * self.INDEX_STRIDE + 1, len(timestamps))
+        return lo + int(np.searchsorted(timestamps[lo:hi], value, side='left'))
+
+    def slice(self, start: Optional[float] = None, end: Optional[float] = None,
+              symbol: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Events with start <= timestamp < end.
+
+        For one symbol the result wraps zero-copy views of the mapped
+        columns. Without `symbol`, partitions are merged by timestamp
+        (a copy of the window only).
+        """
+        if symbol is None:
+            parts = [self.slice(start, end, sym, columns) for sym in self.symbols]
+            if not parts:
+                return pd.DataFrame(columns=columns)
+            merged = pd.concat(parts, ignore_index=True)
+            return merged.sort_values('timestamp', kind='mergesort').reset_index(drop=True)
+
+        part = self._partitions[symbol]
+        lo = 0 if start is None else self._locate(symbol, start)
+        hi = len(part) if end is None else self._locate(symbol, end)
+        hi = max(lo, hi)
+        data = {}
+        for col in columns or part.columns:
+            values = part[col].array
+            data[col] = values[lo:hi] if isinstance(values, pd.Categorical) else part[col].to_numpy()[lo:hi]
+        out = pd.DataFrame(data, copy=False)
+        out.attrs.update(part.attrs)
+        return out
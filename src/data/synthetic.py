@@ -1,6 +1,15 @@
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import Tuple, Optional, Iterator, List, Union
+from .hawkes import HawkesParams, simulate_hawkes
+
+@dataclass
+class _StreamState:
+    """Values carried from one vectorized chunk to the next."""
+    log_price: float = 0.0
+    time: float = 0.0
+    order_id: int = 0
 
 class SyntheticLOBGenerator:
     """
@@ -13,20 +22,21 @@ class SyntheticLOBGenerator:
                  initial_price: float = 100.0, 
                  volatility: float = 0.02, 
                  dt: float = 1.0,
-                 seed: Optional[int] = None):
+                 seed: Union[int, np.random.SeedSequence, None] = None):
         """
         Args:
             symbol: Ticker symbol.
             initial_price: Starting mid-price.
             volatility: Annualized volatility.
             dt: Time step in seconds.
-            seed: Random seed.
+            seed: Random seed, or a SeedSequence (e.g. one spawned per symbol).
         """
         self.symbol = symbol
         self.initial_price = initial_price
         self.volatility = volatility
         self.dt = dt
-        self.rng = np.random.default_rng(seed)
+        self.seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_seq)
 
     def generate_price_process(self, n_steps: int) -> np.ndarray:
         """Generates a Geometric Brownian Motion price path."""
@@ -39,9 +49,14 @@ class SyntheticLOBGenerator:
         price_path = self.initial_price * np.exp(np.cumsum(returns))
         return np.insert(price_path, 0, self.initial_price)
 
-    def generate_lob_events(self, n_events: int = 10000) -> pd.DataFrame:
+    def generate_lob_events(self, n_events: int = 10000, vectorized: bool = False) -> pd.DataFrame:
         """
         Generates a stream of LOB events.
+
+        Args:
+            n_events: Number of events to generate.
+            vectorized: Draw all random quantities as whole arrays instead of
+                per event (see `_generate_vectorized` for the seed guarantee).
         
         Events:
         - 1: Submission of new limit order
@@ -50,7 +65,9 @@ class SyntheticLOBGenerator:
         - 4: Execution (Visible)
         - 5: Execution (Hidden - ignored for now)
         """
-        
+        if vectorized:
+            return self._generate_vectorized(n_events)
+
         # 1. Generate underlying mid-price process
         # We assume roughly 1 event per time step for simplicity in this baseline
         mid_prices = self.generate_price_process(n_events)
@@ -108,10 +125,160 @@ class SyntheticLOBGenerator:
         df = pd.DataFrame(events)
         return df
 
-def generate_synthetic_lob(n_events: int = 10000, **kwargs) -> pd.DataFrame:
-    """Wrapper function to generate data easily."""
+    def iter_lob_events(self, n_events: int = 10000, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Streams the vectorized event stream as fixed-size DataFrame chunks.
+
+        Price path, clock and order_id continue across chunk boundaries, so
+        peak memory is bounded by `chunk_size`. For the same seed the
+        concatenated chunks equal `generate_lob_events(n_events, vectorized=True)`.
+
+        Args:
+            n_events: Total number of events.
+            chunk_size: Events per chunk (the last chunk may be shorter).
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        streams = self._spawn_streams()
+        state = _StreamState()
+        for start in range(0, n_events, chunk_size):
+            yield self._vectorized_chunk(min(chunk_size, n_events - start), streams, state)
+
+    def _generate_vectorized(self, n_events: int) -> pd.DataFrame:
+        """
+        Vectorized equivalent of the event loop in `generate_lob_events`.
+
+        Every random quantity (price returns, inter-arrival times, event type,
+        side, spread, distance and Pareto size) is drawn as one array from its
+        own child stream spawned from the generator's seed. Event mix, price
+        and size distributions are the same as the loop.
+
+        Seed guarantee: for a fixed `seed`, the n-th call returns the same frame
+        on every run and platform. The values are not identical to the loop
+        mode, which interleaves its draws on a single stream.
+        """
+        return self._vectorized_chunk(n_events, self._spawn_streams(), _StreamState())
+
+    def generate_hawkes_events(self, n_events: int = 10000, params: Optional[HawkesParams] = None) -> pd.DataFrame:
+        """
+        Generates LOB events whose limit/market/cancel arrivals follow a
+        multivariate Hawkes process with exponential kernels.
+
+        Arrivals are simulated with an O(1)-per-event intensity recursion
+        (see `simulate_hawkes`); prices and sizes are drawn as in the
+        vectorized mode, with mid-price diffusion scaled by the actual
+        inter-arrival times.
+
+        Args:
+            n_events: Number of events to generate.
+            params: Hawkes parameters in events per second (defaults to `HawkesParams()`).
+        """
+        params = params if params is not None else HawkesParams()
+        rng_time, rng_ret, rng_side, rng_spread, rng_dist, rng_size = self._spawn_streams()[:6]
+
+        times, kinds = simulate_hawkes(n_events, params, rng_time)
+        timestamps = times * self.dt
+
+        sigma = self.volatility / np.sqrt(252 * 23400)
+        elapsed = np.diff(np.concatenate(([0.0], timestamps)))
+        returns = rng_ret.standard_normal(n_events) * sigma * np.sqrt(elapsed)
+        log_path = np.cumsum(np.concatenate(([0.0], returns)))
+        mid = self.initial_price * np.exp(log_path[:n_events])
+
+        is_limit = kinds == 0
+        side, price, size = self._order_attributes(is_limit, mid, rng_side, rng_spread, rng_dist, rng_size)
+        event_type = np.array([1, 4, 3], dtype=np.int64)[kinds]
+
+        return pd.DataFrame({
+            "timestamp": timestamps,
+            "symbol": np.array([self.symbol], dtype=object).repeat(n_events),
+            "event_type": event_type,
+            "side": side,
+            "price": price,
+            "size": size,
+            "order_id": np.arange(n_events, dtype=np.int64),
+        }, copy=False)
+
+    @staticmethod
+    def _order_attributes(is_limit: np.ndarray, mid: np.ndarray,
+                          rng_side: np.random.Generator, rng_spread: np.random.Generator,
+                          rng_dist: np.random.Generator, rng_size: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized side, price and size draws shared by the array-based modes."""
+        n_events = len(mid)
+        side = np.where(rng_side.random(n_events) < 0.5, 1, -1).astype(np.int64)
+
+        # Limit orders rest away from mid; everything else prints at mid
+        spread = rng_spread.lognormal(mean=-4, sigma=0.5, size=n_events) * mid
+        distance = rng_dist.standard_exponential(n_events) * spread
+        price = np.where(is_limit, mid - side * distance, mid)
+        price = np.round(price, 2)
+
+        size_scale = np.where(is_limit, 100, 50)
+        size = (rng_size.pareto(a=1.5, size=n_events) * size_scale).astype(np.int64)
+        return side, price, size
+
+    def _spawn_streams(self) -> List[np.random.Generator]:
+        """One independent stream per random quantity of the vectorized mode."""
+        return [np.random.default_rng(s) for s in self.seed_seq.spawn(7)]
+
+    def _vectorized_chunk(self, n_events: int, streams: List[np.random.Generator],
+                          state: _StreamState) -> pd.DataFrame:
+        """
+        Draws the next `n_events` events and advances `state`.
+
+        Each stream is consumed element by element, and running sums start
+        from the carried value, so splitting a run into chunks reproduces
+        the one-shot output bit for bit.
+        """
+        rng_ret, rng_time, rng_type, rng_side, rng_spread, rng_dist, rng_size = streams
+
+        sigma = self.volatility / np.sqrt(252 * 23400)
+        sigma_dt = sigma * np.sqrt(self.dt)
+
+        # Mid price seen by event i is the path *before* the i-th return
+        returns = rng_ret.normal(0, sigma_dt, n_events)
+        log_path = np.cumsum(np.concatenate(([state.log_price], returns)))
+        mid = self.initial_price * np.exp(log_path[:n_events])
+
+        clock = np.cumsum(np.concatenate(([state.time], rng_time.exponential(self.dt, n_events))))
+        timestamps = clock[1:]
+
+        type_rand = rng_type.random(n_events)
+        is_limit = type_rand < 0.5
+        is_market = (type_rand >= 0.5) & (type_rand < 0.8)
+
+        side, price, size = self._order_attributes(is_limit, mid, rng_side, rng_spread, rng_dist, rng_size)
+
+        event_type = np.select([is_limit, is_market], [1, 4], default=3).astype(np.int64)
+
+        first_id = state.order_id
+        state.log_price = log_path[-1]
+        state.time = clock[-1]
+        state.order_id += n_events
+
+        return pd.DataFrame({
+            "timestamp": timestamps,
+            "symbol": np.array([self.symbol], dtype=object).repeat(n_events),
+            "event_type": event_type,
+            "side": side,
+            "price": price,
+            "size": size,
+            "order_id": np.arange(first_id, first_id + n_events, dtype=np.int64),
+        }, index=pd.RangeIndex(first_id, first_id + n_events), copy=False)
+
+def generate_synthetic_lob(n_events: int = 10000, vectorized: bool = False,
+                           hawkes: Optional[HawkesParams] = None, **kwargs) -> pd.DataFrame:
+    """Wrapper function to generate data easily. Pass `hawkes` for clustered order flow."""
+    generator = SyntheticLOBGenerator(**kwargs)
+    if hawkes is not None:
+        return generator.generate_hawkes_events(n_events, hawkes)
+    return generator.generate_lob_events(n_events, vectorized=vectorized)
+
+def generate_synthetic_lob_chunks(n_events: int = 10000, chunk_size: int = 100_000, **kwargs) -> Iterator[pd.DataFrame]:
+    """Streaming counterpart of `generate_synthetic_lob` (vectorized mode)."""
     generator = SyntheticLOBGenerator(**kwargs)
-    return generator.generate_lob_events(n_events)
+    return generator.iter_lob_events(n_events, chunk_size=chunk_size)
 
 if __name__ == "__main__":
     # Test run
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
+from .synthetic import SyntheticLOBGenerator
+
+def _generate_symbol(spec: Dict, n_events: int, seed_seq: np.random.SeedSequence, vectorized: bool) -> pd.DataFrame:
+    """Worker: generates the event stream of a single symbol."""
+    generator = SyntheticLOBGenerator(seed=seed_seq, **spec)
+    return generator.generate_lob_events(n_events, vectorized=vectorized)
+
+def generate_synthetic_universe(specs: List[Dict],
+                                n_events: Union[int, List[int]] = 10000,
+                                seed: Optional[int] = None,
+                                n_workers: Optional[int] = None,
+                                merge: bool = True,
+                                vectorized: bool = True) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Generates a multi-symbol synthetic universe over a process pool.
+
+    Each symbol gets its own stream spawned from `seed`, in the order of
+    `specs`, so the result does not depend on `n_workers` or scheduling.
+
+    Args:
+        specs: One dict of `SyntheticLOBGenerator` arguments per symbol
+            (symbol, initial_price, volatility, dt). Symbols must be unique.
+        n_events: Events per symbol, either shared or one per spec.
+        seed: Root seed of the universe.
+        n_workers: Worker processes; 1 generates in-process, None uses all cores.
+        merge: Return one stream ordered by timestamp (ties keep spec order)
+            instead of a dict of per-symbol frames.
+        vectorized: Use the vectorized generator mode.
+    """
+    symbols = [spec.get('symbol', 'SYM') for spec in specs]
+    if len(set(symbols)) != len(symbols):
+        raise ValueError("Symbols in a universe must be unique")
+
+    counts = [n_events] * len(specs) if np.isscalar(n_events) else list(n_events)
+    if len(counts) != len(specs):
+        raise ValueError("n_events must be an int or have one entry per spec")
+
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(specs))
+    args = (specs, counts, seed_seqs, [vectorized] * len(specs))
+
+    if n_workers == 1:
+        frames = list(map(_generate_symbol, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            frames = list(pool.map(_generate_symbol, *args))
+
+    if not merge:
+        return dict(zip(symbols, frames))
+
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.sort_values('timestamp', kind='mergesort').reset_index(drop=True)
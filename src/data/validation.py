@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional
+
+VALID_EVENT_TYPES = (1, 2, 3, 4, 5)
+VALID_SIDES = (1, -1)
+
+RULES = (
+    'missing_value',
+    'non_positive_price',
+    'non_positive_size',
+    'non_monotonic_timestamp',
+    'unknown_event_type',
+    'invalid_side',
+)
+
+@dataclass
+class ValidationReport:
+    """
+    Per-rule violation counts and first offending row positions.
+
+    Rows are numbered by position in the (possibly chunked) stream. A
+    report is truthy when it has seen rows and none broke a rule, so it
+    can be used wherever `DataLoader.validate` used to return a bool.
+    """
+    n_rows: int = 0
+    counts: Dict[str, int] = field(default_factory=lambda: {rule: 0 for rule in RULES})
+    first_row: Dict[str, Optional[int]] = field(default_factory=lambda: {rule: None for rule in RULES})
+    _last_timestamp: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def is_valid(self) -> bool:
+        return self.n_rows > 0 and not any(self.counts.values())
+
+    def __bool__(self) -> bool:
+        return self.is_valid
+
+    def update(self, df: pd.DataFrame) -> 'ValidationReport':
+        """
+        Checks one chunk in a single vectorized pass over its columns.
+        Timestamp order is also checked across the previous chunk boundary.
+        """
+        missing = [col for col in ('timestamp', 'event_type', 'side', 'price', 'size') if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        if len(df) == 0:
+            return self
+
+        ts = df['timestamp'].to_numpy()
+        event_type = df['event_type'].to_numpy()
+        side = df['side'].to_numpy()
+        price = df['price'].to_numpy()
+        size = df['size'].to_numpy()
+
+        # Compared in the column's own dtype: int64 nanoseconds must not round through float
+        backwards = np.empty(len(ts), dtype=bool)
+        backwards[0] = self._last_timestamp is not None and ts[0] < self._last_timestamp
+        backwards[1:] = ts[1:] < ts[:-1]
+
+        masks = {
+            'missing_value': pd.isna(ts) | pd.isna(event_type) | pd.isna(side) | pd.isna(price) | pd.isna(size),
+            'non_positive_price': price <= 0,
+            'non_positive_size': size <= 0,
+            'non_monotonic_timestamp': backwards,
+            'unknown_event_type': ~np.isin(event_type, VALID_EVENT_TYPES),
+            'invalid_side': ~np.isin(side, VALID_SIDES),
+        }
+        for rule, mask in masks.items():
+            count = int(np.count_nonzero(mask))
+            if count:
+                self.counts[rule] += count
+                if self.first_row[rule] is None:
+                    self.first_row[rule] = self.n_rows + int(np.argmax(mask))
+
+        self.n_rows += len(ts)
+        self._last_timestamp = ts[-1]
+        return self
+
+    def track(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Validates chunks as they stream past, so checking costs no extra scan."""
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'count': self.counts, 'first_row': self.first_row}).rename_axis('rule')
@@ -1,2 +1,3 @@
 from .backtest import BacktestRunner
 from .metrics import ExecutionMetrics
+from .walk_forward import walk_forward
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from typing import List
 from src.simulation.engine import Trade
+from src.data.schema import price_values
 
 class ExecutionMetrics:
     """
@@ -19,6 +20,21 @@ class ExecutionMetrics:
         
         return total_val / total_vol if total_vol > 0 else 0.0
 
+    @staticmethod
+    def calculate_market_vwap(df: pd.DataFrame) -> float:
+        """
+        Calculates the VWAP of market executions (event_type 4) in event data,
+        e.g. as a benchmark. Accepts the standard and the compact schema.
+        """
+        trades = (df['event_type'] == 4).to_numpy()
+        if not trades.any():
+            return 0.0
+
+        prices = price_values(df)[trades]
+        sizes = df['size'].to_numpy()[trades].astype(np.float64)
+        total_vol = sizes.sum()
+        return float((prices * sizes).sum() / total_vol) if total_vol > 0 else 0.0
+
     @staticmethod
     def calculate_slippage(trades: List[Trade], benchmark_price: float) -> float:
         """
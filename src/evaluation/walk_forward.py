@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from src.features.cache import fingerprint
+from src.impact_models.prediction import PricePredictor, resolve_backend, backend_name
+
+def walk_forward_splits(n_rows: int, n_folds: int, train_size: Optional[int] = None) -> List[Tuple[slice, slice]]:
+    """
+    Contiguous (train, test) row ranges: the data is cut into n_folds + 1
+    blocks and fold k tests on block k + 1, training on everything before it
+    (expanding window) or on the last `train_size` rows (rolling window).
+    """
+    edges = np.linspace(0, n_rows, n_folds + 2).astype(int)
+    splits = []
+    for k in range(n_folds):
+        test_start, test_end = edges[k + 1], edges[k + 2]
+        train_start = 0 if train_size is None else max(0, test_start - train_size)
+        splits.append((slice(train_start, test_start), slice(test_start, test_end)))
+    return splits
+
+def model_key(train: pd.DataFrame, backend: Union[str, Callable], model_params: Dict) -> str:
+    """Persistence key: training data fingerprint plus backend and hyperparameters."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(fingerprint(train).encode())
+    digest.update(json.dumps([backend_name(backend), model_params], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def _run_fold(fold: int, train: pd.DataFrame, test: pd.DataFrame, backend: Callable, model_params: Dict,
+              model_path: Optional[str]) -> Dict:
+    """Worker: fits (or loads) one fold's model and scores it on the test block."""
+    cached = model_path is not None and os.path.exists(model_path)
+    if cached:
+        with open(model_path, 'rb') as f:
+            predictor, train_seconds = pickle.load(f)
+    else:
+        predictor = PricePredictor(backend=backend, model_params=model_params)
+        start = time.perf_counter()
+        predictor.train(train)
+        train_seconds = time.perf_counter() - start
+        if model_path is not None:
+            with open(model_path + '.tmp', 'wb') as f:
+                pickle.dump((predictor, train_seconds), f)
+            os.replace(model_path + '.tmp', model_path)
+
+    # The last test row has no next price, so no target
+    X, y = predictor.prepare_features(test)
+    X, y = X[:-1], np.asarray(y)[:-1]
+    proba = predictor.predict_proba(X)
+    classes = getattr(predictor.model, 'classes_', None) if predictor.is_trained else None
+    classes = np.asarray(classes) if classes is not None else np.array([-1, 0, 1])
+    predicted = classes[np.argmax(proba, axis=1)]
+    return {
+        'fold': fold,
+        'train_rows': len(train),
+        'test_rows': len(X),
+        'accuracy': float(np.mean(predicted == y)) if len(y) else float('nan'),
+        'train_seconds': train_seconds,
+        'cached': cached,
+    }
+
+def walk_forward(df: pd.DataFrame,
+                 n_folds: int = 5,
+                 train_size: Optional[int] = None,
+                 backend: Union[str, Callable] = 'logistic',
+                 model_params: Optional[Dict] = None,
+                 n_workers: Optional[int] = 1,
+                 model_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Walk-forward evaluation of `PricePredictor` on a time-ordered feature frame.
+
+    Folds are trained and scored in parallel worker processes. Each fold
+    trains on its window minus the last row, whose next-price target would
+    be the first test price. With
+    `model_dir`, each fitted model is pickled under a key of its training
+    data fingerprint, backend and hyperparameters, so a rerun loads
+    completed folds instead of refitting them.
+
+    Args:
+        df: Frame with the `PricePredictor.prepare_features` columns (ofi, tfi, price).
+        n_folds: Number of test blocks.
+        train_size: Rolling training window in rows; None = expanding window.
+        backend: `PricePredictor` backend ('logistic', 'lightgbm', ...) or a
+            model factory. Names are resolved here and the factory is sent to
+            the workers, so backends from `register_backend` work with spawned
+            processes too (the factory itself must be picklable, i.e. a
+            module-level function).
+        model_params: Hyperparameters of the backend model.
+        n_workers: Worker processes; 1 runs in-process, None uses all cores.
+        model_dir: Directory of persisted fold models (None = no persistence).
+
+    Returns:
+        One row per fold: fold, train_rows, test_rows, accuracy,
+        train_seconds (of the original fit for cached folds) and cached.
+    """
+    model_params = dict(model_params or {})
+    factory = resolve_backend(backend)
+    if model_dir is not None:
+        os.makedirs(model_dir, exist_ok=True)
+
+    tasks = []
+    for fold, (train_rows, test_rows) in enumerate(walk_forward_splits(len(df), n_folds, train_size)):
+        # The last training row's target is the move into the test block: leave it out
+        train, test = df.iloc[train_rows.start:train_rows.stop - 1], df.iloc[test_rows]
+        path = None
+        if model_dir is not None:
+            path = os.path.join(model_dir, model_key(train, backend, model_params) + '.pkl')
+        tasks.append((fold, train, test, factory, model_params, path))
+
+    args = list(zip(*tasks))
+    if n_workers == 1:
+        results = list(map(_run_fold, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_run_fold, *args))
+    return pd.DataFrame(results)
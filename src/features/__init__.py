@@ -1,2 +1,9 @@
 from .microstructure import MicrostructureFeatures
 from .volatility import VolatilityFeatures
+from .book import OrderBookReconstructor
+from .horizons import MultiHorizonFeatures
+from .online import OnlineFeatureEngine
+from .realized import RealizedVolatilityFeatures
+from .bars import BarBuilder
+from .volume_curve import VolumeCurveEstimator
+from .cache import FeatureCache
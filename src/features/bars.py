@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from typing import Iterable, Union
+from src.data.schema import price_values
+from .utils import event_nanoseconds
+
+class BarBuilder:
+    """
+    Aggregates trades into tick, volume or dollar bars.
+
+    A bar closes at the first trade where the cumulative trade count, size or
+    notional reaches the next multiple of `threshold`; bar ends are found
+    with one `searchsorted` on the cumulative sum and all bar statistics are
+    segment reductions (`np.*.reduceat`). A single trade that crosses
+    several multiples closes one bar.
+
+    Trades after the last complete bar are kept, with their cumulative
+    measure, and prepended to the next `update`. The running sum continues
+    from the last trade seen rather than restarting per chunk, so chunked
+    input adds in the same order and yields bit-identical bars to one
+    frame. `flush` emits the trailing partial bar.
+    """
+
+    BAR_TYPES = ('tick', 'volume', 'dollar')
+    COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'dollar_volume', 'vwap', 'n_trades', 'signed_volume']
+
+    def __init__(self, bar_type: str = 'volume', threshold: float = 1000):
+        """
+        Args:
+            bar_type: 'tick' (trade count), 'volume' (size) or 'dollar' (price * size).
+            threshold: Amount of the bar measure per bar.
+        """
+        if bar_type not in self.BAR_TYPES:
+            raise ValueError(f"Unknown bar type: {bar_type}")
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+        self.bar_type = bar_type
+        self.threshold = threshold
+        self.next_multiple = 1 # Multiple of `threshold` that closes the next bar
+        self.total = 0.0 # Cumulative measure at the last trade seen
+        self.pending = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), np.empty(0))
+        self.pending_cumulative = np.empty(0)
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Consumes the trades of a time-ordered chunk and returns the bars it completes."""
+        trades = df['event_type'].to_numpy() == 4
+        new_price = price_values(df)[trades]
+        new_size = df['size'].to_numpy(dtype=np.float64)[trades]
+        ns = np.concatenate((self.pending[0], event_nanoseconds(df)[trades]))
+        price = np.concatenate((self.pending[1], new_price))
+        size = np.concatenate((self.pending[2], new_size))
+        side = np.concatenate((self.pending[3], df['side'].to_numpy(dtype=np.float64)[trades]))
+
+        if self.bar_type == 'tick':
+            measure = np.ones(len(new_price))
+        elif self.bar_type == 'volume':
+            measure = new_size
+        else:
+            measure = new_price * new_size
+        # Sequential sum continued from the last trade: same additions as in one pass
+        running = np.cumsum(np.concatenate(([self.total], measure)))[1:]
+        cumulative = np.concatenate((self.pending_cumulative, running))
+        if len(running):
+            self.total = running[-1]
+
+        last = self._multiples(cumulative[-1]) if len(cumulative) else 0
+        targets = self.threshold * np.arange(self.next_multiple, last + 1)
+        # Bar ends (inclusive trade indices); reaching a multiple up to rounding closes the bar
+        ends = np.unique(np.searchsorted(cumulative, targets - self._tolerance(targets), side='left'))
+
+        n_closed = ends[-1] + 1 if len(ends) else 0
+        self.pending = (ns[n_closed:], price[n_closed:], size[n_closed:], side[n_closed:])
+        self.pending_cumulative = cumulative[n_closed:]
+        if n_closed:
+            self.next_multiple = self._multiples(cumulative[n_closed - 1]) + 1
+        return self._bars(ns[:n_closed], price[:n_closed], size[:n_closed], side[:n_closed], ends)
+
+    def flush(self) -> pd.DataFrame:
+        """Emits the incomplete bar built from the remaining trades, if any."""
+        ns, price, size, side = self.pending
+        self.pending = tuple(array[:0] for array in self.pending)
+        self.pending_cumulative = self.pending_cumulative[:0]
+        self.next_multiple = 1
+        self.total = 0.0
+        return self._bars(ns, price, size, side, np.array([len(price) - 1]) if len(price) else np.empty(0, dtype=np.int64))
+
+    def _tolerance(self, value):
+        """Float slack of the running sum: relative to its magnitude, at least to the threshold."""
+        return 1e-9 * np.maximum(self.threshold, value)
+
+    def _multiples(self, value: float) -> int:
+        """Multiples of `threshold` reached by a cumulative measure, within the tolerance."""
+        return int(np.floor((value + self._tolerance(value)) / self.threshold))
+
+    def _bars(self, ns, price, size, side, ends) -> pd.DataFrame:
+        starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.int64) if len(ends) else np.empty(0, dtype=np.int64)
+        if not len(starts):
+            return pd.DataFrame(columns=self.COLUMNS, index=pd.DatetimeIndex([], name='datetime'))
+
+        notional = price * size
+        volume = np.add.reduceat(size, starts)
+        dollar_volume = np.add.reduceat(notional, starts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = dollar_volume / volume
+        bars = pd.DataFrame({
+            'open': price[starts],
+            'high': np.maximum.reduceat(price, starts),
+            'low': np.minimum.reduceat(price, starts),
+            'close': price[ends],
+            'volume': volume,
+            'dollar_volume': dollar_volume,
+            'vwap': vwap,
+            'n_trades': ends - starts + 1,
+            'signed_volume': np.add.reduceat(size * side, starts),
+        }, index=pd.DatetimeIndex(ns[ends], name='datetime'))
+        return bars
+
+    @classmethod
+    def build(cls, df: Union[pd.DataFrame, Iterable[pd.DataFrame]], flush: bool = True, **kwargs) -> pd.DataFrame:
+        """
+        One-shot bar construction from a frame or an iterable of time-ordered chunks.
+
+        Args:
+            df: Event data or chunks (standard or compact schema).
+            flush: Include the trailing partial bar.
+            **kwargs: `bar_type` and `threshold`.
+        """
+        builder = cls(**kwargs)
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        parts = [builder.update(chunk) for chunk in chunks]
+        if flush:
+            parts.append(builder.flush())
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            return builder.flush()
+        return pd.concat(parts)
@@ -0,0 +1,285 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, Optional
+from src.data.schema import is_compact, tick_sizes
+
+EMPTY = np.iinfo(np.int64).min # Sampled touch of an empty side
+
+def _take(queue: Optional[deque], qty: Optional[float] = None):
+    """Takes `qty` from a level's resting orders in time priority (all of them if None)."""
+    while queue:
+        order = queue[0]
+        if qty is not None and qty < order[2]:
+            order[2] -= qty
+            return
+        if qty is not None:
+            qty -= order[2]
+        order[2] = 0
+        queue.popleft()
+        if qty is not None and qty <= 0:
+            return
+
+class OrderBookReconstructor:
+    """
+    Rebuilds the limit order book from an event stream.
+
+    Price levels live in two flat arrays (bid and ask quantity per tick)
+    indexed by `tick - base`, grown on demand, with the touch tracked
+    incrementally, so updates never go through nested dicts. Resting orders
+    are keyed by `order_id` to apply partial cancels, deletions and
+    executions (LOBSTER codes 1-5, side = side of the resting order), and
+    queued per level in time priority, so quantity taken by a sweep is
+    taken from the right orders. Orders consumed by a sweep stay known with
+    nothing left, so later events on their ids are no-ops.
+
+    Events on unknown order ids fall back to the repo's synthetic
+    convention: cancels reduce the level at their price, executions are
+    aggressor-side market orders that consume the opposite touch.
+    Submissions that cross the opposite touch execute against it first.
+
+    State persists across `update` calls, so chunks can be fed in order.
+    """
+
+    COLUMNS = ['bid_price', 'ask_price', 'bid_size', 'ask_size', 'spread',
+               'bid_depth', 'ask_depth', 'depth_imbalance']
+
+    def __init__(self, tick_size: float = 0.01, depth_levels: int = 5, sample_every: int = 1,
+                 capacity: int = 4096):
+        """
+        Args:
+            tick_size: Price grid of the book.
+            depth_levels: Number of ticks from the touch summed into depth.
+            sample_every: Emit a snapshot after every n-th event.
+            capacity: Initial number of price levels per side.
+        """
+        self.tick_size = tick_size
+        self.depth_levels = depth_levels
+        self.sample_every = sample_every
+        self.bids = [0.0] * capacity
+        self.asks = [0.0] * capacity
+        self.base: Optional[int] = None
+        self.best_bid = -1 # Array index, -1 = empty side
+        self.best_ask = -1
+        self.orders = {} # order_id -> [side, index, remaining]
+        self.queues: Dict[int, Dict[int, deque]] = {1: {}, -1: {}} # side -> tick -> resting orders, FIFO
+        self.n_events = 0
+
+    def _grow(self, tick: int):
+        """Extends the level arrays so that `tick` is addressable."""
+        size = len(self.bids)
+        if self.base is None:
+            self.base = tick - size // 2
+            return
+        idx = tick - self.base
+        if idx < 0:
+            grow = max(-idx, size)
+            self.bids[:0] = [0.0] * grow
+            self.asks[:0] = [0.0] * grow
+            self.base -= grow
+            if self.best_bid >= 0:
+                self.best_bid += grow
+            if self.best_ask >= 0:
+                self.best_ask += grow
+            for order in self.orders.values():
+                order[1] += grow
+        elif idx >= size:
+            grow = max(idx - size + 1, size)
+            self.bids.extend([0.0] * grow)
+            self.asks.extend([0.0] * grow)
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies a chunk of events and returns the sampled book snapshots,
+        indexed by the chunk's index labels.
+        """
+        if is_compact(df):
+            if len(tick_sizes(df)) != 1:
+                raise ValueError("Reconstruct one symbol at a time")
+            price_ticks = df['price'].to_numpy().tolist()
+        else:
+            price_ticks = np.rint(df['price'].to_numpy() / self.tick_size).astype(np.int64).tolist()
+
+        event_types = df['event_type'].to_numpy().tolist()
+        sides = df['side'].to_numpy().tolist()
+        sizes = df['size'].to_numpy().tolist()
+        if 'order_id' in df.columns:
+            order_ids = df['order_id'].to_numpy().tolist()
+        else:
+            # No ids: every event is its own order, so cancels/executions use the fallbacks
+            order_ids = range(-self.n_events - 1, -self.n_events - 1 - len(df), -1)
+
+        k = self.sample_every
+        depth = self.depth_levels
+        orders = self.orders
+        offset = (-self.n_events) % k
+        rows, best_bids, best_asks, bid_sizes, ask_sizes, bid_depths, ask_depths = [], [], [], [], [], [], []
+
+        # Hot loop: all book state in locals, written back only when the arrays grow
+        if self.base is None and price_ticks:
+            self._grow(price_ticks[0])
+        bids, asks, base = self.bids, self.asks, self.base
+        bb, ba = self.best_bid, self.best_ask
+        n_levels = len(bids)
+        bid_queues, ask_queues = self.queues[1], self.queues[-1]
+
+        for i in range(len(event_types)):
+            etype = event_types[i]
+            qty = sizes[i]
+            if etype == 1:
+                idx = price_ticks[i] - base
+                if idx < 0 or idx >= n_levels:
+                    self.best_bid, self.best_ask = bb, ba
+                    self._grow(price_ticks[i])
+                    bids, asks, base = self.bids, self.asks, self.base
+                    bb, ba = self.best_bid, self.best_ask
+                    n_levels = len(bids)
+                    idx = price_ticks[i] - base
+                side = sides[i]
+                if side == 1:
+                    # Marketable part executes against the asks
+                    while qty > 0 and 0 <= ba <= idx:
+                        level = asks[ba]
+                        if qty < level:
+                            asks[ba] = level - qty
+                            _take(ask_queues.get(ba + base), qty)
+                            qty = 0
+                        else:
+                            qty -= level
+                            asks[ba] = 0.0
+                            _take(ask_queues.pop(ba + base, None))
+                            ba += 1
+                            while ba < n_levels and asks[ba] <= 0:
+                                ba += 1
+                            if ba == n_levels:
+                                ba = -1
+                    if qty > 0:
+                        bids[idx] += qty
+                        if idx > bb:
+                            bb = idx
+                        order = orders[order_ids[i]] = [1, idx, qty]
+                        queue = bid_queues.get(idx + base)
+                        if queue is None:
+                            queue = bid_queues[idx + base] = deque()
+                        queue.append(order)
+                else:
+                    while qty > 0 and bb >= idx and bb >= 0:
+                        level = bids[bb]
+                        if qty < level:
+                            bids[bb] = level - qty
+                            _take(bid_queues.get(bb + base), qty)
+                            qty = 0
+                        else:
+                            qty -= level
+                            bids[bb] = 0.0
+                            _take(bid_queues.pop(bb + base, None))
+                            bb -= 1
+                            while bb >= 0 and bids[bb] <= 0:
+                                bb -= 1
+                    if qty > 0:
+                        asks[idx] += qty
+                        if ba < 0 or idx < ba:
+                            ba = idx
+                        order = orders[order_ids[i]] = [-1, idx, qty]
+                        queue = ask_queues.get(idx + base)
+                        if queue is None:
+                            queue = ask_queues[idx + base] = deque()
+                        queue.append(order)
+
+            elif etype != 5:
+                order = orders.get(order_ids[i])
+                if order is not None:
+                    side, idx = order[0], order[1]
+                    if etype == 3 or qty >= order[2]:
+                        qty = order[2]
+                        order[2] = 0 # Skipped (and dropped) by the level queue
+                        del orders[order_ids[i]]
+                    else:
+                        order[2] -= qty
+                elif etype == 4:
+                    # Unknown id: aggressor on `side` sweeps the opposite touch
+                    side = -sides[i]
+                    idx = bb if side == 1 else ba
+                    if idx < 0:
+                        qty = 0
+                else:
+                    side = sides[i]
+                    idx = price_ticks[i] - base
+                    if idx < 0 or idx >= n_levels:
+                        qty = 0
+
+                levels = bids if side == 1 else asks
+                queues = bid_queues if side == 1 else ask_queues
+                sweep = etype == 4 and order is None
+                while qty > 0:
+                    level = levels[idx]
+                    if qty < level:
+                        levels[idx] = level - qty
+                        if sweep:
+                            _take(queues.get(idx + base), qty)
+                        break
+                    levels[idx] = 0.0
+                    _take(queues.pop(idx + base, None))
+                    qty = qty - level if sweep else 0
+                    # Level emptied: move the touch if it was the touch
+                    if side == 1 and idx == bb:
+                        while bb >= 0 and bids[bb] <= 0:
+                            bb -= 1
+                        idx = bb
+                    elif side == -1 and idx == ba:
+                        while ba < n_levels and asks[ba] <= 0:
+                            ba += 1
+                        if ba == n_levels:
+                            ba = -1
+                        idx = ba
+                    if idx < 0:
+                        break
+
+            if i % k == offset:
+                # Absolute ticks: `base` may still move down later in the chunk
+                rows.append(i)
+                best_bids.append(bb + base if bb >= 0 else EMPTY)
+                best_asks.append(ba + base if ba >= 0 else EMPTY)
+                if bb >= 0:
+                    bid_sizes.append(bids[bb])
+                    bid_depths.append(sum(bids[max(bb - depth + 1, 0):bb + 1]))
+                else:
+                    bid_sizes.append(0.0)
+                    bid_depths.append(0.0)
+                if ba >= 0:
+                    ask_sizes.append(asks[ba])
+                    ask_depths.append(sum(asks[ba:ba + depth]))
+                else:
+                    ask_sizes.append(0.0)
+                    ask_depths.append(0.0)
+
+        self.best_bid, self.best_ask = bb, ba
+        self.n_events += len(event_types)
+        return self._snapshots(df, rows, best_bids, best_asks, bid_sizes, ask_sizes, bid_depths, ask_depths)
+
+    def _snapshots(self, df, rows, best_bids, best_asks, bid_sizes, ask_sizes, bid_depths, ask_depths) -> pd.DataFrame:
+        tick = next(iter(tick_sizes(df).values())) if is_compact(df) else self.tick_size
+        best_bids = np.array(best_bids, dtype=np.int64)
+        best_asks = np.array(best_asks, dtype=np.int64)
+        bid_price = np.round(np.where(best_bids != EMPTY, best_bids * tick, np.nan), 10)
+        ask_price = np.round(np.where(best_asks != EMPTY, best_asks * tick, np.nan), 10)
+        bid_depth = np.array(bid_depths, dtype=np.float64)
+        ask_depth = np.array(ask_depths, dtype=np.float64)
+        total = bid_depth + ask_depth
+        with np.errstate(invalid='ignore', divide='ignore'):
+            imbalance = np.where(total > 0, (bid_depth - ask_depth) / total, np.nan)
+        return pd.DataFrame({
+            'bid_price': bid_price,
+            'ask_price': ask_price,
+            'bid_size': np.array(bid_sizes, dtype=np.float64),
+            'ask_size': np.array(ask_sizes, dtype=np.float64),
+            'spread': np.round(ask_price - bid_price, 10),
+            'bid_depth': bid_depth,
+            'ask_depth': ask_depth,
+            'depth_imbalance': imbalance,
+        }, index=df.index[np.array(rows, dtype=np.int64)])
+
+    @classmethod
+    def reconstruct(cls, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """One-shot reconstruction of a single-symbol event frame."""
+        return cls(**kwargs).update(df)
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+PICKLE_SUFFIX = '.pkl'
+SCALAR_TYPES = (str, int, float, bool, type(None), np.integer, np.floating)
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def fingerprint(data: Union[pd.DataFrame, pd.Series]) -> str:
+    """
+    Content hash (blake2b) of a frame or series: column names, dtypes,
+    `attrs` (e.g. the tick size of compact frames), index and the raw column
+    buffers. Object columns are hashed through `pd.util.hash_pandas_object`.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    digest.update(repr((list(frame.columns), [str(dtype) for dtype in frame.dtypes], len(frame))).encode())
+    digest.update(repr(sorted(data.attrs.items())).encode())
+    digest.update(pd.util.hash_pandas_object(frame.index, index=False).to_numpy().tobytes())
+    for name in frame.columns:
+        values = frame[name].to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_pandas_object(frame[name], index=False).to_numpy()
+        digest.update(np.ascontiguousarray(values).view(np.uint8).tobytes())
+    return digest.hexdigest()
+
+class FeatureCache:
+    """
+    Memoizes feature functions on (dataset fingerprint, function, parameters).
+
+    Results live in an in-memory LRU tier bounded by entry count and bytes;
+    with `disk_dir`, they are also pickled there and served after the
+    memory tier evicts them or across sessions (LRU by file mtime, bounded
+    by `disk_max_bytes`, like `EventCache`). Cached results are returned as
+    copies, so callers may modify them.
+
+    Inputs that cannot be fingerprinted (chunk iterators) or parameters that
+    are not plain values bypass the cache.
+
+    Usage:
+        cache = FeatureCache()
+        ofi = cache.compute(MicrostructureFeatures.calculate_ofi, df, time_window='5s')
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 512 * 1024 ** 2,
+                 disk_dir: Optional[str] = None, disk_max_bytes: int = 2 * 1024 ** 3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.stats = CacheStats()
+        self._memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self._sizes = {}
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def compute(self, func: Callable, data: Any, *args, **kwargs) -> Any:
+        """Returns `func(data, *args, **kwargs)`, from the cache when possible."""
+        key = self.key(func, data, *args, **kwargs)
+        if key is None:
+            self.stats.bypassed += 1
+            return func(data, *args, **kwargs)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+            return self._copy(self._memory[key])
+
+        result = self._disk_get(key)
+        if result is not None:
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+        else:
+            self.stats.misses += 1
+            result = func(data, *args, **kwargs)
+            self._disk_put(key, result)
+        self._memory_put(key, result)
+        return self._copy(result)
+
+    def key(self, func: Callable, data: Any, *args, **kwargs) -> Optional[str]:
+        """Cache key, or None if the call cannot be cached."""
+        if not isinstance(data, (pd.DataFrame, pd.Series)):
+            return None
+        params = list(args) + [kwargs[name] for name in sorted(kwargs)]
+        if not all(isinstance(value, SCALAR_TYPES) or self._is_plain_sequence(value) for value in params):
+            return None
+        name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+        signature = repr((name, args, sorted(kwargs.items())))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(fingerprint(data).encode())
+        digest.update(signature.encode())
+        return digest.hexdigest()
+
+    def clear(self, disk: bool = False):
+        """Empties the memory tier (and the disk tier if `disk`)."""
+        self._memory.clear()
+        self._sizes.clear()
+        if disk and self.disk_dir is not None:
+            for name in self._disk_files():
+                os.remove(os.path.join(self.disk_dir, name))
+
+    def memory_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    @staticmethod
+    def _is_plain_sequence(value: Any) -> bool:
+        return isinstance(value, (list, tuple)) and all(isinstance(item, SCALAR_TYPES) for item in value)
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        return result.copy() if hasattr(result, 'copy') else result
+
+    @staticmethod
+    def _nbytes(result: Any) -> int:
+        if isinstance(result, (pd.DataFrame, pd.Series)):
+            return int(np.sum(result.memory_usage(deep=True)))
+        return int(getattr(result, 'nbytes', 0))
+
+    def _memory_put(self, key: str, result: Any):
+        self._memory[key] = result
+        self._sizes[key] = self._nbytes(result)
+        while len(self._memory) > 1 and (len(self._memory) > self.max_entries or self.memory_bytes() > self.max_bytes):
+            oldest, _ = self._memory.popitem(last=False)
+            del self._sizes[oldest]
+            self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + PICKLE_SUFFIX)
+
+    def _disk_files(self):
+        return [name for name in os.listdir(self.disk_dir) if name.endswith(PICKLE_SUFFIX)]
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        if self.disk_dir is None or not os.path.exists(self._disk_path(key)):
+            return None
+        os.utime(self._disk_path(key))
+        return pd.read_pickle(self._disk_path(key))
+
+    def _disk_put(self, key: str, result: Any):
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        pd.to_pickle(result, path + '.tmp', compression=None)
+        os.replace(path + '.tmp', path)
+
+        files = sorted(self._disk_files(), key=lambda name: os.path.getmtime(os.path.join(self.disk_dir, name)))
+        sizes = {name: os.path.getsize(os.path.join(self.disk_dir, name)) for name in files}
+        total = sum(sizes.values())
+        for name in files:
+            if total <= self.disk_max_bytes:
+                break
+            if name == os.path.basename(path):
+                continue
+            os.remove(os.path.join(self.disk_dir, name))
+            total -= sizes[name]
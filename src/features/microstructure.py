@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Iterable, Tuple, Union
+from .utils import combine_chunked, time_buckets, TimeBuckets
+from .book import OrderBookReconstructor
+
+BBO_COLUMNS = ['bid_price', 'ask_price', 'bid_size', 'ask_size']
 
 class MicrostructureFeatures:
     """
@@ -8,75 +12,152 @@ class MicrostructureFeatures:
     """
     
     @staticmethod
-    def calculate_spread(df: pd.DataFrame) -> pd.Series:
+    def calculate_spread(df: pd.DataFrame, tick_size: float = 0.01) -> pd.Series:
         """
         Calculates the bid-ask spread.
-        Note: Requires a reconstructed book state. 
-        For event-based data, this is an approximation based on recent best bid/ask updates.
-        """
-        # In a full LOB replay, we'd track the best bid/ask.
-        # For this synthetic event stream, we can approximate spread if we had BBO data.
-        # Since our synthetic generator outputs events, we need to reconstruct the BBO first.
-        # For simplicity in this version, we will assume the 'price' in the event 
-        # represents a touch of the spread (e.g. limit order at best bid/ask).
-        
-        # A robust implementation requires LOB reconstruction.
-        # Here we will implement a simplified version that assumes we have BBO columns.
+        Uses the `bid_price`/`ask_price` columns when present, otherwise the
+        BBO is reconstructed from the event stream (see `reconstruct_book`).
+        """
         if 'ask_price' in df.columns and 'bid_price' in df.columns:
             return df['ask_price'] - df['bid_price']
-        else:
-            # Return empty or error if BBO not present
-            return pd.Series(np.nan, index=df.index)
+        return MicrostructureFeatures.reconstruct_book(df, tick_size=tick_size)['spread']
+
+    @staticmethod
+    def reconstruct_book(df: pd.DataFrame, tick_size: float = 0.01, depth_levels: int = 5,
+                         sample_every: int = 1) -> pd.DataFrame:
+        """
+        Replays a single-symbol event stream through `OrderBookReconstructor`
+        and returns BBO, spread, top-N depth and depth imbalance columns for
+        every `sample_every`-th event.
+        """
+        reconstructor = OrderBookReconstructor(tick_size=tick_size, depth_levels=depth_levels,
+                                               sample_every=sample_every)
+        return reconstructor.update(df)
+
+    @staticmethod
+    def bucket_index(df: pd.DataFrame, time_window: str = '1s') -> TimeBuckets:
+        """
+        Precomputes the time-bucket index of `df`, to be shared by
+        `calculate_ofi`, `calculate_tfi` and the volume profile.
+        """
+        return time_buckets(df, time_window)
 
     @staticmethod
-    def calculate_ofi(df: pd.DataFrame, time_window: str = '1s') -> pd.DataFrame:
+    def calculate_ofi(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], time_window: str = '1s',
+                      buckets: Optional[TimeBuckets] = None, method: str = 'auto') -> pd.DataFrame:
         """
         Calculates Order Flow Imbalance (OFI).
         OFI = Change in Bid Size - Change in Ask Size (at best quotes).
         
         This implementation aggregates events over a time window.
+        `df` may also be an iterable of time-ordered chunks, in either the
+        standard or the compact schema (see `src.data.schema`).
+
+        Args:
+            df: Event data.
+            time_window: Bucket width (ignored when `buckets` is given).
+            buckets: Shared index from `bucket_index(df, time_window)`.
+            method: 'events' signs raw order flow (limit +, cancel/trade -);
+                'best_quote' uses the Cont et al. (2014) definition from the
+                `bid_price`/`ask_price`/`bid_size`/`ask_size` columns; 'auto'
+                picks 'best_quote' when those columns are present.
         """
-        # Filter for Limit Orders (1) and Cancels (3)
-        # Side: 1=Buy (Bid), -1=Sell (Ask)
-        
-        # We need to sign the size:
-        # Limit Order (1): +Size
-        # Cancel (3): -Size
-        # Execution (4): -Size (removes liquidity)
-        
-        df = df.copy()
-        df['signed_vol'] = df.apply(lambda x: x['size'] if x['event_type'] == 1 else -x['size'], axis=1)
-        
-        # Separate Bid and Ask flow
-        # Bid Flow: Side 1
-        # Ask Flow: Side -1
-        
-        df['bid_flow'] = np.where(df['side'] == 1, df['signed_vol'], 0)
-        df['ask_flow'] = np.where(df['side'] == -1, df['signed_vol'], 0)
-        
-        # Resample
-        df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
-        resampled = df.set_index('datetime').resample(time_window)[['bid_flow', 'ask_flow']].sum()
-        
+        if not isinstance(df, pd.DataFrame):
+            return combine_chunked(MicrostructureFeatures.calculate_ofi,
+                                   MicrostructureFeatures._carry_quote(df, method), time_window, method=method)
+
+        bid_flow, ask_flow = MicrostructureFeatures.order_flow(df, method)
+        buckets = buckets if buckets is not None else time_buckets(df, time_window)
+        if len(buckets.labels) == 0:
+            return pd.DataFrame(columns=['bid_flow', 'ask_flow', 'ofi'], index=pd.DatetimeIndex([]))
+
+        resampled = pd.DataFrame({'bid_flow': buckets.sum(bid_flow), 'ask_flow': buckets.sum(ask_flow)},
+                                 index=buckets.labels.rename('datetime'))
         resampled['ofi'] = resampled['bid_flow'] - resampled['ask_flow']
         return resampled
 
     @staticmethod
-    def calculate_tfi(df: pd.DataFrame, time_window: str = '1s') -> pd.DataFrame:
+    def order_flow(df: pd.DataFrame, method: str = 'auto') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-event bid and ask flow underlying `calculate_ofi` (see there for
+        `method`). Summing these over any interval gives that interval's OFI.
+        """
+        if method == 'auto':
+            method = 'best_quote' if all(col in df.columns for col in BBO_COLUMNS) else 'events'
+        if method == 'events':
+            # Limit Order (1): +Size, Cancel (3) / Execution (4): -Size
+            # Side: 1=Buy (Bid), -1=Sell (Ask)
+            size = df['size'].to_numpy()
+            signed_vol = np.where(df['event_type'].to_numpy() == 1, size, -size)
+            side = df['side'].to_numpy()
+            return np.where(side == 1, signed_vol, 0), np.where(side == -1, signed_vol, 0)
+        if method == 'best_quote':
+            return (MicrostructureFeatures._quote_flow(df['bid_price'], df['bid_size'], 1),
+                    MicrostructureFeatures._quote_flow(df['ask_price'], df['ask_size'], -1))
+        raise ValueError(f"Unknown OFI method: {method}")
+
+    @staticmethod
+    def _carry_quote(chunks: Iterable[pd.DataFrame], method: str) -> Iterable[pd.DataFrame]:
+        """
+        Prepends the previous chunk's last row to each best-quote chunk, so the
+        first quote change of a chunk is measured against the prior BBO. The
+        carried row itself contributes no flow (see `_quote_flow`).
+        """
+        previous = None
+        for chunk in chunks:
+            if method == 'best_quote' or (method == 'auto' and all(col in chunk.columns for col in BBO_COLUMNS)):
+                carried = pd.concat([previous, chunk]) if previous is not None else chunk
+                if len(chunk):
+                    previous = chunk.iloc[-1:]
+                chunk = carried
+            yield chunk
+
+    @staticmethod
+    def trade_flow(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-event signed trade volume (zero for non-trades) and the trade mask."""
+        trades = df['event_type'].to_numpy() == 4
+        size = df['size'].to_numpy()
+        signed_vol = np.where(df['side'].to_numpy() == 1, size, -size)
+        return np.where(trades, signed_vol, 0), trades
+
+    @staticmethod
+    def _quote_flow(price: pd.Series, size: pd.Series, side: int) -> np.ndarray:
+        """
+        Per-event contribution of one side of the BBO (Cont, Kukanov & Stoikov):
+        bid: 1{P_n >= P_n-1} q_n - 1{P_n <= P_n-1} q_n-1, mirrored for the ask.
+        An empty side (NaN price) contributes nothing.
+        """
+        p = price.to_numpy(dtype=np.float64)
+        q = np.nan_to_num(size.to_numpy(dtype=np.float64))
+        p_prev, q_prev = p[:-1], q[:-1]
+        p_now, q_now = p[1:], q[1:]
+        if side == 1:
+            up, down = p_now >= p_prev, p_now <= p_prev
+        else:
+            up, down = p_now <= p_prev, p_now >= p_prev
+        flow = np.zeros(len(p))
+        flow[1:] = np.where(up, q_now, 0.0) - np.where(down, q_prev, 0.0)
+        flow[1:][np.isnan(p_now) | np.isnan(p_prev)] = 0.0
+        return flow
+
+    @staticmethod
+    def calculate_tfi(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], time_window: str = '1s',
+                      buckets: Optional[TimeBuckets] = None) -> pd.DataFrame:
         """
         Calculates Trade Flow Imbalance (TFI).
         TFI = Buy Volume - Sell Volume.
+        `df` may also be an iterable of time-ordered chunks; both schemas are accepted.
+        Pass `buckets` from `bucket_index` to reuse the OFI bucket assignment.
         """
-        df = df.copy()
+        if not isinstance(df, pd.DataFrame):
+            return combine_chunked(MicrostructureFeatures.calculate_tfi, df, time_window)
+
         # Filter for Trades (4)
-        trades = df[df['event_type'] == 4].copy()
-        
-        if trades.empty:
+        signed_vol, trades = MicrostructureFeatures.trade_flow(df)
+        if not trades.any():
             return pd.DataFrame(columns=['tfi'])
 
-        trades['signed_vol'] = np.where(trades['side'] == 1, trades['size'], -trades['size'])
-        
-        trades['datetime'] = pd.to_datetime(trades['timestamp'], unit='s')
-        resampled = trades.set_index('datetime').resample(time_window)['signed_vol'].sum()
-        
-        return resampled.to_frame(name='tfi')
+        buckets = buckets if buckets is not None else time_buckets(df, time_window)
+        span = buckets.span(trades)
+        tfi = buckets.sum(signed_vol)[span]
+        return pd.DataFrame({'tfi': tfi}, index=buckets.labels[span].rename('datetime'))
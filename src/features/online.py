@@ -0,0 +1,156 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Optional
+from src.data.schema import NS_PER_SECOND
+
+class OnlineFeatureEngine:
+    """
+    Streaming OFI, TFI, volume and realized volatility with O(1) state.
+
+    Fed one event at a time (by `SimulationEngine` when passed as
+    `features=`), it keeps:
+      - running sums for the current `time_window` bucket; the last completed
+        bucket equals the corresponding row of `MicrostructureFeatures.calculate_ofi`
+        / `calculate_tfi` and `VolatilityFeatures.calculate_volume_profile`
+        (buckets anchored to the epoch, as in `time_buckets`);
+      - a ring buffer of the last `vol_window` returns with a windowed Welford
+        mean/variance, matching `VolatilityFeatures.calculate_realized_volatility`
+        on the series of observed prices (limit and trade events, as in the engine);
+        the sums are recomputed from the buffer on every wrap, so rounding
+        error cannot build up over long streams (amortized O(1));
+      - an exponentially decayed OFI with a half-life in seconds.
+
+    All reads are attribute lookups, so strategies can poll them every event.
+    """
+
+    def __init__(self, time_window: str = '1s', vol_window: int = 20, ofi_halflife: float = 1.0,
+                 keep_history: bool = False):
+        """
+        Args:
+            time_window: Bucket width for OFI/TFI/volume.
+            vol_window: Number of returns in the realized volatility window.
+            ofi_halflife: Half-life (seconds) of the decayed OFI.
+            keep_history: Record every completed bucket (see `history_frame`).
+        """
+        self.width = pd.Timedelta(time_window).value
+        self.vol_window = vol_window
+        self.decay_rate = math.log(2.0) / ofi_halflife
+        self.keep_history = keep_history
+        self.history = []
+
+        # Current and last completed bucket
+        self.bucket: Optional[int] = None
+        self.bid_flow = 0.0
+        self.ask_flow = 0.0
+        self.tfi = 0.0
+        self.volume = 0.0
+        self.last_bucket = None # (label, bid_flow, ask_flow, tfi, volume)
+
+        # Realized volatility
+        self.returns = np.zeros(vol_window)
+        self.n_returns = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last_price = float('nan')
+
+        # Decayed OFI
+        self.ewm_ofi = 0.0
+        self.time = None
+
+    @property
+    def ofi(self) -> float:
+        """OFI of the current (incomplete) bucket."""
+        return self.bid_flow - self.ask_flow
+
+    @property
+    def last_ofi(self) -> float:
+        """OFI of the last completed bucket (0.0 before the first one closes)."""
+        if self.last_bucket is None:
+            return 0.0
+        return self.last_bucket[1] - self.last_bucket[2]
+
+    @property
+    def realized_volatility(self) -> float:
+        """Sample std of the last `vol_window` returns; NaN until the window is full."""
+        if self.n_returns < self.vol_window:
+            return float('nan')
+        return math.sqrt(max(self.m2, 0.0) / (self.vol_window - 1))
+
+    def update(self, timestamp: float, event_type: int, side: int, price: float, size: float):
+        """Applies one event (timestamp in seconds)."""
+        ns = int(round(timestamp * NS_PER_SECOND))
+        bucket = ns // self.width
+        if self.bucket is None:
+            self.bucket = bucket
+        elif bucket != self.bucket:
+            self._roll(bucket)
+
+        # Order flow: limit +size, cancel/trade -size, on the side of the event
+        signed = size if event_type == 1 else -size
+        if side == 1:
+            self.bid_flow += signed
+        elif side == -1:
+            self.ask_flow += signed
+        if event_type == 4:
+            self.tfi += size if side == 1 else -size
+            self.volume += size
+
+        if self.time is not None:
+            self.ewm_ofi *= math.exp(-self.decay_rate * (timestamp - self.time))
+        self.ewm_ofi += signed if side == 1 else -signed if side == -1 else 0.0
+        self.time = timestamp
+
+        if event_type in (1, 4):
+            self._update_price(price)
+
+    def _roll(self, bucket: int):
+        """Closes the current bucket and any empty ones before `bucket`."""
+        completed = (self._label(self.bucket), self.bid_flow, self.ask_flow, self.tfi, self.volume)
+        if self.keep_history:
+            self.history.append(completed)
+            for empty in range(self.bucket + 1, bucket):
+                self.history.append((self._label(empty), 0.0, 0.0, 0.0, 0.0))
+        if bucket > self.bucket + 1:
+            completed = (self._label(bucket - 1), 0.0, 0.0, 0.0, 0.0)
+        self.last_bucket = completed
+        self.bucket = bucket
+        self.bid_flow = self.ask_flow = self.tfi = self.volume = 0.0
+
+    def _label(self, bucket: int) -> pd.Timestamp:
+        return pd.Timestamp(bucket * self.width)
+
+    def _update_price(self, price: float):
+        last, self.last_price = self.last_price, price
+        if last != last: # First observation (NaN)
+            return
+        ret = price / last - 1.0
+        slot = self.n_returns % self.vol_window
+        if self.n_returns < self.vol_window:
+            # Welford: add
+            n = self.n_returns + 1
+            delta = ret - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (ret - self.mean)
+        else:
+            # Welford: replace the oldest return at fixed n
+            old = self.returns[slot]
+            delta = ret - old
+            new_mean = self.mean + delta / self.vol_window
+            self.m2 += delta * (ret - new_mean + old - self.mean)
+            self.mean = new_mean
+        self.returns[slot] = ret
+        self.n_returns += 1
+        if slot == self.vol_window - 1 and self.n_returns > self.vol_window:
+            # Buffer wrapped: resynchronise the running sums with the window
+            self.mean = float(self.returns.mean())
+            self.m2 = float(np.square(self.returns - self.mean).sum())
+
+    def history_frame(self, include_current: bool = False) -> pd.DataFrame:
+        """Completed buckets (requires `keep_history`) in the batch OFI layout plus tfi/volume."""
+        rows = list(self.history)
+        if include_current and self.bucket is not None:
+            rows.append((self._label(self.bucket), self.bid_flow, self.ask_flow, self.tfi, self.volume))
+        frame = pd.DataFrame(rows, columns=['datetime', 'bid_flow', 'ask_flow', 'tfi', 'volume']).set_index('datetime')
+        frame['ofi'] = frame['bid_flow'] - frame['ask_flow']
+        return frame
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Union
+from src.data.schema import is_compact
+
+@dataclass
+class TimeBuckets:
+    """
+    Precomputed time-bucket assignment for one event frame.
+
+    `codes[i]` is the bucket of event i, `labels[b]` the left edge of bucket
+    b. Edges follow `resample(origin='epoch')` (left closed and labelled), so
+    bucketing does not depend on where the frame starts and chunked outputs
+    line up with one-shot ones.
+    """
+    codes: np.ndarray
+    labels: pd.DatetimeIndex
+    time_window: str
+
+    def sum(self, values: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per-bucket sums of `values` (optionally only where `mask`)."""
+        codes = self.codes if mask is None else self.codes[mask]
+        weights = values if mask is None else values[mask]
+        sums = np.bincount(codes, weights=weights, minlength=len(self.labels))
+        if np.issubdtype(np.asarray(values).dtype, np.integer):
+            return np.rint(sums).astype(np.int64)
+        return sums
+
+    def span(self, mask: np.ndarray) -> slice:
+        """Bucket range covered by the events in `mask` (as `resample` on that subset)."""
+        codes = self.codes[mask]
+        return slice(int(codes.min()), int(codes.max()) + 1)
+
+def event_nanoseconds(df: pd.DataFrame) -> np.ndarray:
+    """Timestamps as int64 nanoseconds for either schema, rounded like `pd.to_datetime(unit='s')`."""
+    if is_compact(df):
+        return df['timestamp'].to_numpy().astype(np.int64, copy=False)
+    return pd.to_datetime(df['timestamp'].to_numpy(), unit='s').asi8
+
+def time_buckets(df: pd.DataFrame, time_window: str) -> TimeBuckets:
+    """Assigns every event to a `time_window` bucket in one vectorized pass."""
+    width = pd.Timedelta(time_window).value
+    ns = event_nanoseconds(df)
+    if len(ns) == 0:
+        return TimeBuckets(np.empty(0, dtype=np.int64), pd.DatetimeIndex([]), time_window)
+
+    bucket = ns // width
+    lo = bucket.min()
+    codes = bucket - lo
+    n_buckets = int(codes.max()) + 1
+    labels = pd.date_range(pd.Timestamp(lo * width), periods=n_buckets, freq=pd.Timedelta(width))
+    return TimeBuckets(codes, labels, time_window)
+
+def combine_chunked(func: Callable[..., Union[pd.DataFrame, pd.Series]],
+                    chunks: Iterable[pd.DataFrame],
+                    time_window: str,
+                    **kwargs) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Applies a resampling feature function chunk by chunk and merges the results.
+
+    Buckets are anchored to the epoch, so a bucket split across two chunks is
+    simply summed; the final resample also restores empty buckets that fall
+    between chunks. Only one chunk plus the (small) bucketed output is held
+    in memory at a time.
+    """
+    parts = []
+    for chunk in chunks:
+        part = func(chunk, time_window=time_window, **kwargs)
+        if not part.empty:
+            parts.append(part)
+
+    if not parts:
+        return func(pd.DataFrame(columns=['timestamp', 'event_type', 'side', 'price', 'size']),
+                    time_window=time_window, **kwargs)
+
+    return pd.concat(parts).resample(time_window, origin='epoch').sum()
@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+from typing import Iterable, Optional, Union
+from .utils import combine_chunked, time_buckets, TimeBuckets
 
 class VolatilityFeatures:
     """
@@ -15,13 +17,21 @@ class VolatilityFeatures:
         return returns.rolling(window=window).std()
 
     @staticmethod
-    def calculate_volume_profile(df: pd.DataFrame, time_window: str = '1min') -> pd.Series:
+    def calculate_volume_profile(df: Union[pd.DataFrame, Iterable[pd.DataFrame]], time_window: str = '1min',
+                                 buckets: Optional[TimeBuckets] = None) -> pd.Series:
         """
         Calculates volume profile (total traded volume per bucket).
+        `df` may also be an iterable of time-ordered chunks. `buckets` can be
+        shared with the OFI/TFI calculations (`MicrostructureFeatures.bucket_index`).
         """
-        trades = df[df['event_type'] == 4].copy()
-        if trades.empty:
+        if not isinstance(df, pd.DataFrame):
+            return combine_chunked(VolatilityFeatures.calculate_volume_profile, df, time_window)
+
+        trades = df['event_type'].to_numpy() == 4
+        if not trades.any():
             return pd.Series()
-            
-        trades['datetime'] = pd.to_datetime(trades['timestamp'], unit='s')
-        return trades.set_index('datetime').resample(time_window)['size'].sum()
+
+        buckets = buckets if buckets is not None else time_buckets(df, time_window)
+        span = buckets.span(trades)
+        volume = buckets.sum(df['size'].to_numpy(), trades)[span]
+        return pd.Series(volume, index=buckets.labels[span].rename('datetime'), name='size')
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from scipy.stats import trim_mean
+from src.data.schema import NS_PER_SECOND
+from .utils import event_nanoseconds
+from .cache import fingerprint
+
+DAY_NS = 86400 * NS_PER_SECOND
+
+def _day_profile(time_of_day: np.ndarray, sizes: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Worker: traded volume per time-of-day bin for one day."""
+    bins = np.searchsorted(edges, time_of_day, side='right') - 1
+    bins[time_of_day == edges[-1]] = len(edges) - 2 # Session end belongs to the last bin
+    inside = (bins >= 0) & (bins < len(edges) - 1)
+    return np.bincount(bins[inside], weights=sizes[inside], minlength=len(edges) - 1)
+
+class VolumeCurveEstimator:
+    """
+    Estimates the intraday volume curve (share of daily volume per
+    time-of-day bin) from many days of trades.
+
+    Each day's bin volumes are computed in its own worker and normalised to
+    fractions; the curve is their median or trimmed mean across days, so a
+    single abnormal session does not distort it. Curves are cached per
+    content fingerprint of the data (see `src.features.cache`), symbol and
+    lookback, and can be passed directly as `VWAPStrategy(volume_profile=...)`.
+    """
+
+    METHODS = ('median', 'trimmed')
+
+    def __init__(self, n_bins: int = 10, session: Optional[Tuple[float, float]] = None,
+                 method: str = 'median', trim: float = 0.1, n_workers: Optional[int] = 1):
+        """
+        Args:
+            n_bins: Number of equal time-of-day bins.
+            session: (start, end) of the trading session in seconds after
+                midnight; None uses the observed time-of-day range.
+            method: 'median' or 'trimmed' (mean after cutting `trim` of the
+                days from each tail, per bin).
+            trim: Tail fraction for the trimmed mean.
+            n_workers: Worker processes (one day per task); 1 runs in-process,
+                None uses all cores.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        self.n_bins = n_bins
+        self.session = session
+        self.method = method
+        self.trim = trim
+        self.n_workers = n_workers
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    def estimate(self, df: pd.DataFrame, symbol: Optional[str] = None, lookback: int = 20) -> np.ndarray:
+        """
+        Volume curve over the last `lookback` days of `df`.
+
+        Args:
+            df: Event data (standard or compact schema); only trades are used.
+            symbol: Restrict to one symbol of a multi-symbol frame.
+            lookback: Number of most recent days to aggregate.
+
+        Returns:
+            Array of `n_bins` fractions summing to 1 (uniform if there is no volume).
+        """
+        trades = df['event_type'].to_numpy() == 4
+        if symbol is not None and 'symbol' in df.columns:
+            trades &= (df['symbol'] == symbol).to_numpy()
+        ns = event_nanoseconds(df)[trades]
+        sizes = df['size'].to_numpy(dtype=np.float64)[trades]
+        if len(ns) == 0:
+            return np.full(self.n_bins, 1.0 / self.n_bins)
+
+        key = (fingerprint(df), symbol, lookback)
+        if key in self._cache:
+            return self._cache[key]
+
+        day = ns // DAY_NS
+        last_day = int(day.max())
+
+        recent = day > last_day - lookback
+        ns, sizes, day = ns[recent], sizes[recent], day[recent]
+        time_of_day = ns - day * DAY_NS
+        edges = self._edges(time_of_day)
+
+        # Trades of one day are contiguous once sorted by day
+        order = np.argsort(day, kind='stable')
+        splits = np.flatnonzero(np.diff(day[order])) + 1
+        days_tod = np.split(time_of_day[order], splits)
+        days_size = np.split(sizes[order], splits)
+        args = (days_tod, days_size, [edges] * len(days_tod))
+        if self.n_workers == 1:
+            volumes = list(map(_day_profile, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                volumes = list(pool.map(_day_profile, *args))
+
+        curve = self._aggregate(np.array(volumes))
+        self._cache[key] = curve
+        return curve
+
+    def _edges(self, time_of_day: np.ndarray) -> np.ndarray:
+        if self.session is not None:
+            start, end = (int(round(t * NS_PER_SECOND)) for t in self.session)
+        else:
+            start, end = int(time_of_day.min()), int(time_of_day.max()) + 1
+        return np.linspace(start, end, self.n_bins + 1)
+
+    def _aggregate(self, volumes: np.ndarray) -> np.ndarray:
+        totals = volumes.sum(axis=1)
+        if not (totals > 0).any():
+            return np.full(self.n_bins, 1.0 / self.n_bins)
+        fractions = volumes[totals > 0] / totals[totals > 0, None]
+        if self.method == 'median':
+            curve = np.median(fractions, axis=0)
+        else:
+            curve = trim_mean(fractions, self.trim, axis=0)
+        if curve.sum() <= 0:
+            return np.full(self.n_bins, 1.0 / self.n_bins)
+        return curve / curve.sum()
+
+    def clear_cache(self):
+        self._cache.clear()
@@ -44,7 +44,7 @@ class ImpactFrame(ctk.CTkFrame):
             model = AlmgrenChrissModel(params)
             
             rates = np.linspace(0, 1000, 100)
-            temp_impacts = [model.calculate_temporary_impact(r, 0.02) for r in rates]
+            temp_impacts = model.calculate_temporary_impact(rates, 0.02)
             
             clear_frame(self.plot_frame)
             fig, ax = plt.subplots(figsize=(6, 4))
@@ -1,12 +1,16 @@
 import customtkinter as ctk
 import matplotlib.pyplot as plt
+import pandas as pd
 from src.data.synthetic import generate_synthetic_lob
 from src.impact_models.parametric import AlmgrenChrissModel, ImpactParams
 from src.execution.strategies import TWAPStrategy, VWAPStrategy
 from src.evaluation.backtest import BacktestRunner
 from src.evaluation.metrics import ExecutionMetrics
+from src.features.volume_curve import VolumeCurveEstimator
 from src.gui.utils import embed_matplotlib_figure, clear_frame
 
+HISTORY_DAYS = 5 # Synthetic sessions before the replayed one used for the VWAP volume curve
+
 class SimulationFrame(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
@@ -63,7 +67,14 @@ class SimulationFrame(ctk.CTkFrame):
                 strat_params['n_slices'] = 10
                 strat_cls = TWAPStrategy
             else:
-                strat_params['volume_profile'] = [1] * 10
+                # Curve from earlier sessions only: estimating it from the replayed day would be look-ahead
+                history = []
+                for days_back in range(1, HISTORY_DAYS + 1):
+                    past = generate_synthetic_lob(n_events=2000, volatility=0.1)
+                    past['timestamp'] -= days_back * 86400.0
+                    history.append(past)
+                estimator = VolumeCurveEstimator(n_bins=10, session=(start_time, start_time + duration))
+                strat_params['volume_profile'] = estimator.estimate(pd.concat(history), lookback=HISTORY_DAYS)
                 strat_cls = VWAPStrategy
                 
             trades = runner.run(strat_cls, strat_params)
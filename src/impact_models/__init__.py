@@ -1,2 +1,5 @@
 from .parametric import AlmgrenChrissModel, ImpactParams
 from .prediction import PricePredictor
+from .calibration import calibrate_impact, fit_power_law, CalibrationResult
+from .propagator import PropagatorModel, PropagatorParams
+from .surface import ImpactSurface
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from .parametric import ImpactParams
+
+BATCH_SIZE = 64 # Bootstrap replicates per task, fixed so results do not depend on n_workers
+
+@dataclass
+class CalibrationResult:
+    params: ImpactParams
+    intervals: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    samples: Optional[pd.DataFrame] = None # Bootstrap estimates, one row per replicate
+    n_obs: Dict[str, int] = field(default_factory=dict) # Observations used by the 'temporary' and 'permanent' fits
+
+def fit_power_law(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Least squares fit of y = c * x^p in log-log space.
+
+    `x` and `y` are (n,) or (batch, n); each row is fitted independently
+    with the closed-form OLS slope, so a whole batch of bootstrap samples is
+    one vectorized call.
+
+    Returns:
+        (c, p), scalars or (batch,) arrays.
+    """
+    log_x, log_y = np.log(x), np.log(y)
+    mean_x = log_x.mean(axis=-1, keepdims=True)
+    mean_y = log_y.mean(axis=-1, keepdims=True)
+    dx = log_x - mean_x
+    slope = (dx * (log_y - mean_y)).sum(axis=-1) / (dx ** 2).sum(axis=-1)
+    intercept = mean_y[..., 0] - slope * mean_x[..., 0]
+    return np.exp(intercept), slope
+
+def _prepare(metaorders: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Positive observations of each regression (log-log needs x, y > 0)."""
+    size = metaorders['size'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = size / metaorders['duration'].to_numpy(dtype=np.float64)
+    temporary = metaorders['temporary_impact'].to_numpy(dtype=np.float64)
+    permanent = metaorders['permanent_impact'].to_numpy(dtype=np.float64)
+    temp_ok = (rate > 0) & (temporary > 0) & np.isfinite(rate) & np.isfinite(temporary)
+    perm_ok = (size > 0) & (permanent > 0) & np.isfinite(size) & np.isfinite(permanent)
+    if temp_ok.sum() < 2 or perm_ok.sum() < 2:
+        raise ValueError("Need at least two metaorders with positive size, duration and impact")
+    return {'rate': rate[temp_ok], 'temporary': temporary[temp_ok],
+            'size': size[perm_ok], 'permanent': permanent[perm_ok]}
+
+def _bootstrap_batch(data: Dict[str, np.ndarray], n: int, seed_seq: np.random.SeedSequence) -> np.ndarray:
+    """Worker: `n` bootstrap refits. Returns an (n, 4) array of eta, alpha, gamma, beta."""
+    rng = np.random.default_rng(seed_seq)
+    temp_idx = rng.integers(0, len(data['rate']), size=(n, len(data['rate'])))
+    perm_idx = rng.integers(0, len(data['size']), size=(n, len(data['size'])))
+    eta, alpha = fit_power_law(data['rate'][temp_idx], data['temporary'][temp_idx])
+    gamma, beta = fit_power_law(data['size'][perm_idx], data['permanent'][perm_idx])
+    return np.column_stack([eta, alpha, gamma, beta])
+
+def calibrate_impact(metaorders: pd.DataFrame,
+                     sigma: float = 0.02,
+                     n_bootstrap: int = 0,
+                     confidence: float = 0.95,
+                     seed: Optional[int] = None,
+                     n_workers: Optional[int] = 1) -> CalibrationResult:
+    """
+    Calibrates power-law temporary and permanent impact from metaorders.
+
+        temporary_impact = eta * (size / duration)^alpha
+        permanent_impact = gamma * size^beta
+
+    Both are fitted by least squares in log-log space. Optionally,
+    percentile confidence intervals come from a pairs bootstrap whose
+    replicates are fitted in vectorized batches across a process pool,
+    each batch with its own stream spawned from `seed`.
+
+    Args:
+        metaorders: One row per metaorder with columns size, duration,
+            temporary_impact and permanent_impact (impacts in price units,
+            signed in the direction of the trade; non-positive or missing
+            rows are dropped from the respective fit and not counted in
+            `n_obs`).
+        sigma: Volatility stored in the returned params.
+        n_bootstrap: Number of bootstrap replicates (0 = none).
+        confidence: Coverage of the intervals.
+        seed: Root seed of the bootstrap.
+        n_workers: Worker processes; 1 runs in-process, None uses all cores.
+
+    Returns:
+        CalibrationResult whose `params` plug into `AlmgrenChrissModel`
+        (and hence `SimulationEngine`).
+    """
+    data = _prepare(metaorders)
+    eta, alpha = fit_power_law(data['rate'], data['temporary'])
+    gamma, beta = fit_power_law(data['size'], data['permanent'])
+    params = ImpactParams(eta=float(eta), gamma=float(gamma), sigma=sigma, alpha=float(alpha), beta=float(beta))
+    result = CalibrationResult(params=params, n_obs={'temporary': len(data['rate']), 'permanent': len(data['size'])})
+    if n_bootstrap <= 0:
+        return result
+
+    counts = [BATCH_SIZE] * (n_bootstrap // BATCH_SIZE)
+    if n_bootstrap % BATCH_SIZE:
+        counts.append(n_bootstrap % BATCH_SIZE)
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(counts))
+    args = ([data] * len(counts), counts, seed_seqs)
+    if n_workers == 1:
+        batches = list(map(_bootstrap_batch, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            batches = list(pool.map(_bootstrap_batch, *args))
+
+    samples = pd.DataFrame(np.vstack(batches), columns=['eta', 'alpha', 'gamma', 'beta'])
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    result.samples = samples
+    result.intervals = {name: tuple(float(q) for q in np.nanpercentile(samples[name], [tail, 100.0 - tail]))
+                        for name in samples.columns}
+    return result
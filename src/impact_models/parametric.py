@@ -1,53 +1,143 @@
 import numpy as np
+import pandas as pd
 from dataclasses import dataclass
+from typing import Tuple, Union
+
+ArrayLike = Union[float, np.ndarray]
 
 @dataclass
 class ImpactParams:
-    eta: float = 0.1  # Temporary impact coefficient
-    gamma: float = 0.01 # Permanent impact coefficient
-    sigma: float = 0.02 # Volatility
+    eta: ArrayLike = 0.1  # Temporary impact coefficient
+    gamma: ArrayLike = 0.01 # Permanent impact coefficient
+    sigma: ArrayLike = 0.02 # Volatility
+    alpha: ArrayLike = 1.0 # Temporary impact exponent (0.5 = square-root law)
+    beta: ArrayLike = 1.0 # Permanent impact exponent
 
 class AlmgrenChrissModel:
     """
     Implements the Almgren-Chriss market impact model.
-    
+
     Impact = Temporary Impact + Permanent Impact
-    Temporary Impact (Slippage) = eta * (rate / volatility)
-    Permanent Impact = gamma * size
+    Temporary Impact (Slippage) = eta * rate^alpha
+    Permanent Impact = gamma * size^beta
+
+    The exponents default to 1 (linear model); see
+    `src.impact_models.calibration` to estimate them from metaorders.
+
+    All methods broadcast over NumPy arrays of their arguments and of the
+    `ImpactParams` fields, e.g. a grid of sizes against a grid of horizons.
     """
-    
+
     def __init__(self, params: ImpactParams):
         self.params = params
 
-    def calculate_temporary_impact(self, rate: float, volatility: float) -> float:
+    def calculate_temporary_impact(self, rate: ArrayLike, volatility: ArrayLike) -> ArrayLike:
         """
         Calculates temporary impact (cost per share).
-        h(v) = eta * v
+        h(v) = eta * sign(v) * |v|^alpha
         """
-        # Simplified linear form: eta * rate
-        # In AC2000: eta * sign(v) * |v|^beta
-        # Here we assume linear: eta * rate
-        return self.params.eta * rate
+        return self.params.eta * np.sign(rate) * np.abs(rate) ** self.params.alpha
 
-    def calculate_permanent_impact(self, size: float) -> float:
+    def calculate_permanent_impact(self, size: ArrayLike) -> ArrayLike:
         """
         Calculates permanent impact (price shift).
-        g(v) = gamma * size
+        g(x) = gamma * sign(x) * |x|^beta
         """
-        return self.params.gamma * size
+        return self.params.gamma * np.sign(size) * np.abs(size) ** self.params.beta
 
-    def estimate_cost(self, size: float, time_horizon: float) -> float:
+    def estimate_cost(self, size: ArrayLike, time_horizon: ArrayLike) -> ArrayLike:
         """
         Estimates expected execution cost for a TWAP strategy over time_horizon.
         Rate = size / time_horizon
+        Non-positive horizons cost infinity.
         """
-        if time_horizon <= 0:
-            return float('inf')
-            
-        rate = size / time_horizon
+        size, time_horizon = np.asarray(size, dtype=float), np.asarray(time_horizon, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = size / time_horizon
         temp_impact = self.calculate_temporary_impact(rate, self.params.sigma)
         perm_impact = self.calculate_permanent_impact(size)
-        
-        # Expected cost approx = 0.5 * Permanent * Size + Temporary * Size
-        # (Assuming linear accumulation of permanent impact)
-        return (0.5 * perm_impact * size) + (temp_impact * size)
+
+        # Expected cost = Integral of permanent impact over the executed size + Temporary * Size
+        # (0.5 * Permanent * Size in the linear case)
+        cost = (perm_impact * size / (1.0 + self.params.beta)) + (temp_impact * size)
+        cost = np.where(time_horizon > 0, cost, np.inf)
+        return cost[()] if cost.ndim == 0 else cost
+
+    def urgency(self, risk_aversion: ArrayLike) -> ArrayLike:
+        """kappa = sqrt(lambda * sigma^2 / eta), the inverse half-life of the optimal schedule."""
+        return np.sqrt(np.asarray(risk_aversion, dtype=float) * np.square(self.params.sigma) / self.params.eta)
+
+    def optimal_trajectory(self, size: ArrayLike, time_horizon: ArrayLike, n_steps: int,
+                           risk_aversion: ArrayLike = 0.0) -> np.ndarray:
+        """
+        Closed-form optimal holdings (Almgren & Chriss, 2000):
+            x(t_j) = X * sinh(kappa * (T - t_j)) / sinh(kappa * T),  t_j = j * T / n_steps
+
+        risk_aversion = 0 gives the straight-line (TWAP) schedule; larger
+        values front-load execution. The closed form is exact for linear
+        temporary impact (alpha = 1); otherwise eta is used as the
+        linearised coefficient.
+
+        Args:
+            size: Shares to liquidate (X).
+            time_horizon: Horizon T.
+            n_steps: Number of trading intervals.
+            risk_aversion: Lambda, mean-variance risk aversion.
+
+        Returns:
+            Array of shape broadcast(size, time_horizon, risk_aversion, params) + (n_steps + 1,)
+            with holdings from X at t_0 down to 0 at T.
+        """
+        size, horizon, kappa = np.broadcast_arrays(np.asarray(size, dtype=float),
+                                                   np.asarray(time_horizon, dtype=float),
+                                                   self.urgency(risk_aversion))
+        fraction = np.arange(n_steps + 1) / n_steps
+        a = (kappa * horizon)[..., None]
+        remaining = 1.0 - fraction
+
+        # sinh(a r) / sinh(a) in an overflow-free form; the a -> 0 limit is r (TWAP)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            ratio = np.exp(a * (remaining - 1.0)) * np.expm1(-2.0 * a * remaining) / np.expm1(-2.0 * a)
+        ratio = np.where(a > 1e-8, ratio, remaining)
+        return size[..., None] * ratio
+
+    def trajectory_cost(self, holdings: np.ndarray, time_horizon: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Expected cost and variance of a holdings schedule on an even grid:
+            E = gamma * X^(1+beta) / (1+beta) + eta * sum(|n_j|^(1+alpha)) / tau^alpha
+            V = sigma^2 * tau * sum(x_j^2)
+        with trades n_j = x_j-1 - x_j and tau = T / n_steps. For the TWAP
+        schedule E equals `estimate_cost`.
+
+        Args:
+            holdings: Array (..., n_steps + 1) as from `optimal_trajectory`.
+            time_horizon: Horizon T, broadcast against holdings[..., 0].
+        """
+        holdings = np.asarray(holdings, dtype=float)
+        tau = np.asarray(time_horizon, dtype=float) / (holdings.shape[-1] - 1)
+        trades = -np.diff(holdings, axis=-1)
+        size = holdings[..., 0]
+        alpha, beta = self.params.alpha, self.params.beta
+        expected = (self.params.gamma * np.abs(size) ** (1.0 + beta) / (1.0 + beta)
+                    + self.params.eta * np.sum(np.abs(trades) ** (1.0 + alpha), axis=-1) / tau ** alpha)
+        variance = np.square(self.params.sigma) * tau * np.sum(holdings[..., 1:] ** 2, axis=-1)
+        return expected, variance
+
+    def efficient_frontier(self, size: float, time_horizon: float, risk_aversions: ArrayLike,
+                           n_steps: int = 50) -> pd.DataFrame:
+        """
+        Expected cost and risk of the optimal schedule for every risk
+        aversion in the grid, computed in one vectorized call.
+
+        Returns:
+            DataFrame with columns risk_aversion, expected_cost, variance, std.
+        """
+        risk_aversions = np.atleast_1d(np.asarray(risk_aversions, dtype=float))
+        holdings = self.optimal_trajectory(size, time_horizon, n_steps, risk_aversions)
+        expected, variance = self.trajectory_cost(holdings, time_horizon)
+        return pd.DataFrame({
+            'risk_aversion': risk_aversions,
+            'expected_cost': expected,
+            'variance': variance,
+            'std': np.sqrt(variance),
+        })
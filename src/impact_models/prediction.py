@@ -2,17 +2,179 @@ import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
-from typing import Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+CLASSES = np.array([-1, 0, 1]) # Down, Flat, Up
+
+def _logistic(**params):
+    return LogisticRegression(**{'multi_class': 'multinomial', 'solver': 'lbfgs', **params})
+
+def _lightgbm(**params):
+    # Optional dependency, imported only when the backend is used
+    from lightgbm import LGBMClassifier
+    return LGBMClassifier(**{'objective': 'multiclass', 'n_estimators': 100, 'verbose': -1, **params})
+
+# Model factories by backend name; each returns an unfitted sklearn-style classifier
+BACKENDS: Dict[str, Callable] = {
+    'logistic': _logistic,
+    'lightgbm': _lightgbm,
+}
+
+def register_backend(name: str, factory: Callable):
+    """
+    Makes `PricePredictor(backend=name)` build its model with `factory(**model_params)`.
+
+    The registry is per process; code that fans out to worker processes
+    (e.g. `walk_forward`) resolves the name first and ships the factory.
+    """
+    BACKENDS[name] = factory
+
+def resolve_backend(backend: Union[str, Callable]) -> Callable:
+    """Model factory of a backend given by name (a key of `BACKENDS`) or as the factory itself."""
+    if callable(backend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    return BACKENDS[backend]
+
+def backend_name(backend: Union[str, Callable]) -> str:
+    if callable(backend):
+        return f"{getattr(backend, '__module__', '')}.{getattr(backend, '__qualname__', repr(backend))}"
+    return backend
+
+class SoftmaxSGDClassifier:
+    """
+    Multinomial logistic regression trained by mini-batch SGD.
+
+    sklearn's `SGDClassifier` fits one-vs-rest binary models; this keeps a
+    single softmax over the fixed classes [-1, 0, 1], so `partial_fit` on
+    chunks converges to the same model family as the batch
+    `LogisticRegression(multi_class='multinomial')`.
+    """
+
+    def __init__(self, n_features: int, learning_rate: float = 0.05, alpha: float = 1e-4,
+                 batch_size: int = 256, epochs: int = 1, seed: Optional[int] = None):
+        """
+        Args:
+            n_features: Input dimension.
+            learning_rate: Step size (decayed as 1 / sqrt(1 + t / 1000) over updates).
+            alpha: L2 penalty on the weights.
+            batch_size: Mini-batch size.
+            epochs: Passes over each chunk given to `partial_fit`.
+            seed: Seed of the mini-batch shuffling.
+        """
+        self.classes_ = CLASSES
+        self.coef_ = np.zeros((n_features, len(CLASSES)))
+        self.intercept_ = np.zeros(len(CLASSES))
+        self.learning_rate = learning_rate
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.rng = np.random.default_rng(seed)
+        self.n_updates = 0
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> 'SoftmaxSGDClassifier':
+        """Runs `epochs` shuffled mini-batch passes over one chunk."""
+        targets = (np.asarray(y)[:, None] == CLASSES[None, :]).astype(float)
+        for _ in range(self.epochs):
+            order = self.rng.permutation(len(X))
+            for start in range(0, len(X), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                error = self.predict_proba(X[batch]) - targets[batch]
+                step = self.learning_rate / np.sqrt(1.0 + self.n_updates / 1000.0)
+                self.coef_ -= step * (X[batch].T @ error / len(batch) + self.alpha * self.coef_)
+                self.intercept_ -= step * error.mean(axis=0)
+                self.n_updates += 1
+        return self
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        logits = X @ self.coef_ + self.intercept_
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+class CompiledPredictor:
+    """
+    Allocation-free inference for a fitted scaler + linear softmax model.
+
+    The scaler is folded into the weights, W = coef / scale and
+    b = intercept - (mean / scale) @ coef, so a prediction is one small
+    matrix product and a softmax evaluated in preallocated buffers. Binary
+    sklearn models (one logit) get a zero logit for the first class, which
+    makes the softmax equal sklearn's sigmoid.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray):
+        """
+        Args:
+            weights: (n_features, n_classes) matrix on unscaled features.
+            bias: (n_classes,) logit offsets.
+        """
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = np.ascontiguousarray(bias, dtype=np.float64)
+        self._logits = np.empty(len(self.bias))
+        self._probs = np.empty(len(self.bias))
+
+    @classmethod
+    def from_model(cls, scaler: StandardScaler, model) -> 'CompiledPredictor':
+        """Folds a fitted `StandardScaler` into a `LogisticRegression` or `SoftmaxSGDClassifier`."""
+        if isinstance(model, SoftmaxSGDClassifier):
+            coef, intercept = model.coef_, model.intercept_
+        else:
+            coef, intercept = model.coef_.T, model.intercept_
+            if coef.shape[1] == 1:
+                coef = np.hstack([np.zeros_like(coef), coef])
+                intercept = np.concatenate([[0.0], intercept])
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(coef.shape[0])
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(coef.shape[0])
+        weights = coef / scale[:, None]
+        return cls(weights, intercept - (mean / scale) @ coef)
+
+    def predict_row(self, x: np.ndarray) -> np.ndarray:
+        """
+        Probabilities for one feature vector. The returned array is an
+        internal buffer, overwritten by the next call; copy it to keep it.
+        """
+        logits = np.dot(x, self.weights, out=self._logits)
+        logits += self.bias
+        logits -= logits.max()
+        np.exp(logits, out=self._probs)
+        self._probs /= self._probs.sum()
+        return self._probs
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Probabilities for a (n, n_features) matrix."""
+        logits = X @ self.weights
+        logits += self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
 
 class PricePredictor:
     """
     Predicts short-term price movement (Up/Down/Stationary).
     """
     
-    def __init__(self):
-        self.model = LogisticRegression(multi_class='multinomial', solver='lbfgs')
+    def __init__(self, backend: Union[str, Callable] = 'logistic', model_params: Optional[Dict] = None,
+                 learning_rate: float = 0.05, alpha: float = 1e-4, epochs: int = 1,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            backend: Model used by `train`, a key of `BACKENDS`
+                ('logistic' or 'lightgbm') or a model factory.
+            model_params: Keyword arguments for the backend's model.
+            learning_rate, alpha, epochs, seed: Settings of the incremental
+                `SoftmaxSGDClassifier` used by `partial_train`.
+        """
+        self.backend = backend
+        self.model_params = dict(model_params or {})
+        self.model = resolve_backend(backend)(**self.model_params)
         self.scaler = StandardScaler()
         self.is_trained = False
+        self.sgd_params = dict(learning_rate=learning_rate, alpha=alpha, epochs=epochs, seed=seed)
+        self._pending: Optional[pd.DataFrame] = None # Last row of the previous chunk (target unknown)
+        self._compiled: Optional[CompiledPredictor] = None
 
     def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -53,6 +215,46 @@ class PricePredictor:
             X_scaled = self.scaler.fit_transform(X)
             self.model.fit(X_scaled, y)
             self.is_trained = True
+            self._compiled = None
+
+    def partial_train(self, chunk: pd.DataFrame):
+        """
+        Updates the model with one chunk of a time-ordered feature stream.
+
+        Scaler statistics are updated with `StandardScaler.partial_fit` and
+        the classifier with `SoftmaxSGDClassifier.partial_fit`, so memory is
+        bounded by the chunk size. The last row of each chunk is held back
+        until the next chunk supplies its next-price target. The first call
+        replaces a batch-trained model.
+        """
+        if not isinstance(self.model, SoftmaxSGDClassifier):
+            self.model = None
+            self.scaler = StandardScaler()
+            self._pending = None
+        if self._pending is not None:
+            chunk = pd.concat([self._pending, chunk])
+        if len(chunk) == 0:
+            return
+        self._pending = chunk.iloc[-1:]
+
+        X, y = self.prepare_features(chunk)
+        X, y = X[:-1], np.asarray(y)[:-1]
+        mask = ~np.isnan(X).any(axis=1)
+        X, y = X[mask], y[mask]
+        if len(X) == 0:
+            return
+
+        if self.model is None:
+            self.model = SoftmaxSGDClassifier(n_features=X.shape[1], **self.sgd_params)
+        self.scaler.partial_fit(X)
+        self.model.partial_fit(self.scaler.transform(X), y)
+        self.is_trained = True
+        self._compiled = None
+
+    def train_incremental(self, chunks: Iterable[pd.DataFrame]):
+        """Runs `partial_train` over an iterable of chunks (e.g. daily feature frames)."""
+        for chunk in chunks:
+            self.partial_train(chunk)
 
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """Predicts probabilities of [Down, Flat, Up]."""
@@ -61,3 +263,25 @@ class PricePredictor:
             
         X_scaled = self.scaler.transform(X)
         return self.model.predict_proba(X_scaled)
+
+    def compile(self) -> CompiledPredictor:
+        """Returns the fast inference path for the current model (rebuilt after training)."""
+        if self._compiled is None:
+            if self.is_trained:
+                if not hasattr(self.model, 'coef_'):
+                    raise ValueError(f"Backend '{backend_name(self.backend)}' is not linear and cannot be compiled")
+                self._compiled = CompiledPredictor.from_model(self.scaler, self.model)
+            else:
+                n_features = 2 # ofi, tfi
+                self._compiled = CompiledPredictor(np.zeros((n_features, 3)), np.zeros(3)) # Uniform prior
+        return self._compiled
+
+    def predict_row(self, x: np.ndarray) -> np.ndarray:
+        """
+        Low-latency `predict_proba` for one feature vector, e.g. on every
+        event of a simulation. Returns a reused buffer (see `CompiledPredictor`).
+        Non-linear backends fall back to `predict_proba`.
+        """
+        if self.is_trained and not hasattr(self.model, 'coef_'):
+            return self.predict_proba(np.asarray(x)[None, :])[0]
+        return self.compile().predict_row(x)
@@ -0,0 +1,209 @@
+import math
+import numpy as np
+from typing import Optional, Tuple
+from .parametric import AlmgrenChrissModel, ArrayLike
+
+class ImpactSurface:
+    """
+    Precomputed `AlmgrenChrissModel` impact on log-spaced grids.
+
+    Temporary impact is tabulated over (rate, volatility) and permanent
+    impact over size; lookups interpolate linearly in log-log space, which
+    is exact for pure power laws in the grid direction. Grids are refined
+    (doubling the points per axis) until the interpolation error at every
+    cell midpoint is within `tolerance` (relative). Inputs outside the grid
+    fall back to the exact model, and impact is odd in rate and size, so
+    sells use the mirrored value.
+
+    Components the model does not override are the closed-form power laws,
+    which are exact and cheaper to evaluate than any lookup; they are not
+    tabulated and calls go straight to the model. The surface therefore
+    only pays off for costlier impact functions, and mainly per fill: a
+    vectorized model evaluates whole batches faster than the table gathers.
+
+    The surface exposes the model interface used by `SimulationEngine`
+    (`params`, `calculate_temporary_impact`, `calculate_permanent_impact`),
+    so it can be passed as `impact_model=` directly, and `lookup` evaluates
+    whole batches of (size, rate, volatility) at once.
+    """
+
+    def __init__(self, model: AlmgrenChrissModel,
+                 size_range: Tuple[float, float] = (1.0, 1e6),
+                 rate_range: Tuple[float, float] = (1e-3, 1e5),
+                 vol_range: Tuple[float, float] = (1e-3, 1.0),
+                 tolerance: float = 1e-4,
+                 n_points: int = 16,
+                 max_points: int = 4096):
+        """
+        Args:
+            model: Model to tabulate.
+            size_range, rate_range, vol_range: Positive (min, max) of each axis.
+            tolerance: Maximum relative interpolation error at cell midpoints.
+            n_points: Initial points per axis.
+            max_points: Refinement limit per axis; ValueError if the tolerance
+                is still not met.
+        """
+        self.model = model
+        self.tolerance = tolerance
+        self.size_range, self.rate_range, self.vol_range = size_range, rate_range, vol_range
+        self.exact_permanent = self._is_closed_form(model, 'calculate_permanent_impact')
+        self.exact_temporary = self._is_closed_form(model, 'calculate_temporary_impact')
+
+        self.perm_axis, self.perm_table, perm_error = None, None, 0.0
+        if not self.exact_permanent:
+            self.perm_axis, self.perm_table, perm_error = self._refine(
+                lambda n: (self._axis(size_range, n),),
+                lambda size: model.calculate_permanent_impact(size),
+                n_points, max_points)
+        self.rate_axis, self.vol_axis, self.temp_table, temp_error = None, None, None, 0.0
+        self._temp_rows = None
+        if not self.exact_temporary:
+            self.rate_axis, self.vol_axis, self.temp_table, temp_error = self._refine(
+                lambda n: (self._axis(rate_range, n), self._axis(vol_range, n)),
+                lambda rate, vol: model.calculate_temporary_impact(rate, vol),
+                n_points, max_points)
+            # Scalars for the per-fill path
+            self._rate0, self._rate_step = float(self.rate_axis[0]), float(self.rate_axis[1] - self.rate_axis[0])
+            self._vol0, self._vol_step = float(self.vol_axis[0]), float(self.vol_axis[1] - self.vol_axis[0])
+            self._temp_rows = self.temp_table.tolist() if self.temp_table is not None else None
+        self.max_error = max(perm_error, temp_error)
+
+        # Closed-form components are served by the model's own bound methods (no per-call overhead)
+        if self.exact_permanent:
+            self.calculate_permanent_impact = model.calculate_permanent_impact
+        if self.exact_temporary:
+            self.calculate_temporary_impact = model.calculate_temporary_impact
+
+    @property
+    def params(self):
+        return self.model.params
+
+    @staticmethod
+    def _is_closed_form(model: AlmgrenChrissModel, method: str) -> bool:
+        """True if `method` is the base power law (not overridden by the model's class)."""
+        return getattr(type(model), method) is getattr(AlmgrenChrissModel, method)
+
+    @staticmethod
+    def _axis(value_range: Tuple[float, float], n: int) -> np.ndarray:
+        low, high = value_range
+        if not 0 < low < high:
+            raise ValueError("Ranges must satisfy 0 < min < max")
+        return np.linspace(math.log(low), math.log(high), n)
+
+    def _refine(self, make_axes, func, n_points: int, max_points: int):
+        """Tabulates log|func| on log axes, doubling resolution until the midpoint error is within tolerance."""
+        n = n_points
+        while True:
+            axes = make_axes(n)
+            grid = np.meshgrid(*[np.exp(axis) for axis in axes], indexing='ij')
+            values = func(*grid)
+            if np.all(values == 0):
+                return (*axes, None, 0.0) # Component switched off (e.g. gamma = 0)
+            table = self._log_abs(values)
+            if not np.isfinite(table).all():
+                raise ValueError("Impact must be non-zero and finite over the grid ranges")
+
+            # Exact values at cell midpoints vs interpolation from the corners
+            mid_axes = [(axis[:-1] + axis[1:]) / 2.0 for axis in axes]
+            mid_grid = np.meshgrid(*[np.exp(axis) for axis in mid_axes], indexing='ij')
+            exact = func(*mid_grid)
+            corners = [table[tuple(slice(a, a + len(m)) for a, m in zip(offset, mid_axes))]
+                       for offset in np.ndindex(*(2,) * len(axes))]
+            approx = np.exp(np.mean(corners, axis=0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                error = np.abs(approx - np.abs(exact)) / np.abs(exact)
+            error = float(np.nanmax(np.where(np.abs(exact) > 0, error, np.abs(approx))))
+            if error <= self.tolerance:
+                return (*axes, table, error)
+            if 2 * n - 1 > max_points:
+                raise ValueError(f"Tolerance {self.tolerance} not reached with {n} points per axis (error {error:.2e})")
+            n = 2 * n - 1 # Keeps the existing nodes
+
+    @staticmethod
+    def _log_abs(values: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore'):
+            return np.log(np.abs(values))
+
+    def calculate_temporary_impact(self, rate: ArrayLike, volatility: ArrayLike) -> ArrayLike:
+        """Interpolated `AlmgrenChrissModel.calculate_temporary_impact`."""
+        if isinstance(rate, (int, float)) and isinstance(volatility, (int, float)):
+            return self._temporary_scalar(float(rate), float(volatility))
+        return self._temporary(np.asarray(rate, dtype=float), np.asarray(volatility, dtype=float))
+
+    def calculate_permanent_impact(self, size: ArrayLike) -> ArrayLike:
+        """Interpolated `AlmgrenChrissModel.calculate_permanent_impact`."""
+        size = np.asarray(size, dtype=float)
+        if self.perm_table is None:
+            return np.zeros_like(size)[()]
+        magnitude = np.abs(size)
+        inside = (magnitude >= self.size_range[0]) & (magnitude <= self.size_range[1])
+        with np.errstate(divide='ignore'):
+            value = np.sign(size) * np.exp(np.interp(np.log(magnitude), self.perm_axis, self.perm_table))
+        value = np.where(inside, value, self.model.calculate_permanent_impact(size))
+        return value[()] if value.ndim == 0 else value
+
+    def lookup(self, size: ArrayLike, rate: ArrayLike, volatility: ArrayLike) -> np.ndarray:
+        """Batched per-share impact: temporary(rate, volatility) + permanent(size), broadcast."""
+        return self.calculate_temporary_impact(np.asarray(rate, dtype=float), volatility) + \
+            self.calculate_permanent_impact(size)
+
+    def _temporary(self, rate: np.ndarray, volatility: np.ndarray) -> np.ndarray:
+        rate, volatility = np.broadcast_arrays(rate, volatility)
+        if self.temp_table is None:
+            return np.zeros(rate.shape)[()]
+        n_rate, n_vol = len(self.rate_axis), len(self.vol_axis)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.log(np.abs(rate))
+            x -= self._rate0
+            x /= self._rate_step
+            y = np.log(volatility)
+            y -= self._vol0
+            y /= self._vol_step
+        # Grid coordinates double as the range check (NaN compares False)
+        inside = (x >= 0) & (x <= n_rate - 1) & (y >= 0) & (y <= n_vol - 1)
+        all_inside = inside.all()
+        if not all_inside:
+            x, y = np.where(inside, x, 0.0), np.where(inside, y, 0.0)
+        i = np.minimum(x.astype(np.intp), n_rate - 2)
+        j = np.minimum(y.astype(np.intp), n_vol - 2)
+        fx, fy = x - i, y - j
+        # Gathers on the flattened table: corners (i, j), (i, j+1), (i+1, j), (i+1, j+1)
+        t = self.temp_table.ravel()
+        k = i * n_vol + j
+        t00, t01 = t[k], t[k + 1]
+        k += n_vol
+        t10, t11 = t[k], t[k + 1]
+        low = t00 + fy * (t01 - t00)
+        low += fx * (t10 + fy * (t11 - t10) - low)
+        value = np.exp(low, out=low)
+        value = np.copysign(value, rate, out=value)
+        if not all_inside:
+            value = np.where(inside, value, self.model.calculate_temporary_impact(rate, volatility))
+        return value[()] if value.ndim == 0 else value
+
+    def _temporary_scalar(self, rate: float, volatility: float) -> float:
+        """Per-fill path in plain Python floats (no array allocation)."""
+        if self._temp_rows is None:
+            return 0.0
+        magnitude = abs(rate)
+        if not (self.rate_range[0] <= magnitude <= self.rate_range[1]
+                and self.vol_range[0] <= volatility <= self.vol_range[1]):
+            return float(self.model.calculate_temporary_impact(rate, volatility))
+        x = (math.log(magnitude) - self._rate0) / self._rate_step
+        y = (math.log(volatility) - self._vol0) / self._vol_step
+        i = min(int(x), len(self._temp_rows) - 2)
+        j = min(int(y), len(self._temp_rows[0]) - 2)
+        fx, fy = x - i, y - j
+        row, next_row = self._temp_rows[i], self._temp_rows[i + 1]
+        log_value = ((1 - fx) * ((1 - fy) * row[j] + fy * row[j + 1])
+                     + fx * ((1 - fy) * next_row[j] + fy * next_row[j + 1]))
+        return math.copysign(math.exp(log_value), rate)
+
+    def verify(self, n_samples: int = 100_000, seed: Optional[int] = None) -> float:
+        """Maximum relative error against the exact model at random in-range points."""
+        rng = np.random.default_rng(seed)
+        size = np.exp(rng.uniform(*np.log(self.size_range), n_samples))
+        rate = np.exp(rng.uniform(*np.log(self.rate_range), n_samples))
+        vol = np.exp(rng.uniform(*np.log(self.vol_range), n_samples))
+        exact = self.model.calculate_temporary_impact(rate, vol) + self.model.calculate_permanent_impact(size)
+        return float(np.max(np.abs(self.lookup(size, rate, vol) - exact) / np.abs(exact)))
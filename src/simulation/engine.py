@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Iterable, Iterator, Union
 from src.impact_models.parametric import AlmgrenChrissModel
+from src.impact_models.propagator import PropagatorModel
+from src.data.schema import timestamp_seconds, price_values
+from src.features.online import OnlineFeatureEngine
+
+REPLAY_BLOCK = 65536 # Events converted to Python scalars at a time
 
 @dataclass
 class Order:
@@ -28,13 +33,40 @@ class SimulationEngine:
     Event-driven LOB replay engine.
     """
     
-    def __init__(self, data: pd.DataFrame, impact_model: Optional[AlmgrenChrissModel] = None):
-        self.data = data.sort_values('timestamp').reset_index(drop=True)
+    def __init__(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], impact_model: Optional[AlmgrenChrissModel] = None,
+                 features: Optional[OnlineFeatureEngine] = None,
+                 transient_impact: Optional[PropagatorModel] = None):
+        """
+        Args:
+            data: Event DataFrame (sorted by timestamp if it is not already),
+                or an iterable of time-ordered chunks
+                (e.g. `generate_synthetic_lob_chunks`). A chunk iterator is
+                consumed by `run` and can only be replayed once.
+            impact_model: Optional impact model applied to market orders.
+            features: Optional streaming feature engine, updated with every
+                event before the strategy callback (read it as `engine.features`).
+            transient_impact: Optional propagator model; market orders then
+                also pay the decaying impact left by the engine's own
+                earlier fills, and move it by their own size.
+        """
+        if isinstance(data, pd.DataFrame):
+            # Time-ordered input (e.g. an EventStore window) is used as-is, without a copy
+            if data['timestamp'].is_monotonic_increasing:
+                self.data = data
+            else:
+                self.data = data.sort_values('timestamp').reset_index(drop=True)
+            self._chunks = None
+        else:
+            self.data = None
+            self._chunks = data
         self.impact_model = impact_model
+        self.features = features
+        self.transient_impact = transient_impact.state() if transient_impact is not None else None
         self.current_time = 0.0
         self.current_price = 100.0 # Default fallback
         self.trades: List[Trade] = []
         self.active_orders: List[Order] = []
+        self._open_orders: List[Order] = [] # Orders still NEW, in submission order
         self.order_id_counter = 0
 
     def submit_order(self, side: int, size: float, order_type: str = 'MARKET', price: Optional[float] = None) -> int:
@@ -49,6 +81,7 @@ class SimulationEngine:
             timestamp=self.current_time
         )
         self.active_orders.append(order)
+        self._open_orders.append(order)
         return order.id
 
     def run(self, strategy_step_func: Callable[['SimulationEngine'], None]):
@@ -56,28 +89,61 @@ class SimulationEngine:
         Runs the simulation.
         strategy_step_func: Callback function called on every event (or periodically).
         """
-        for _, event in self.data.iterrows():
-            self.current_time = event['timestamp']
-            
-            # Update market state
-            if event['event_type'] in [1, 4]: # Limit or Trade
-                # Update price estimate (using last trade or mid approx)
-                self.current_price = event['price']
-            
-            # 1. Check for fills (Limit Orders)
-            # Simplified: If price crosses limit, fill.
-            # Real matching would require full LOB reconstruction.
-            self._match_limit_orders()
-            
-            # 2. Execute Market Orders immediately
-            self._execute_market_orders()
-            
-            # 3. Strategy Step
-            strategy_step_func(self)
-            
+        for chunk in self._iter_chunks():
+            self._replay(chunk, strategy_step_func)
+
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        if self._chunks is None:
+            yield self.data
+        else:
+            yield from self._chunks
+
+    def _replay(self, data: pd.DataFrame, strategy_step_func: Callable[['SimulationEngine'], None]):
+        """
+        Replays one time-ordered block of events (standard or compact schema).
+
+        Columns are extracted once as NumPy arrays and converted to Python
+        scalars block by block, so the loop touches no pandas objects and
+        memory stays bounded for long frames.
+        """
+        timestamps = timestamp_seconds(data)
+        prices = price_values(data)
+        event_types = data['event_type'].to_numpy()
+        sides = data['side'].to_numpy()
+        sizes = data['size'].to_numpy()
+        features = self.features
+
+        for start in range(0, len(data), REPLAY_BLOCK):
+            block = slice(start, start + REPLAY_BLOCK)
+            for timestamp, event_type, side, price, size in zip(
+                    timestamps[block].tolist(), event_types[block].tolist(), sides[block].tolist(),
+                    prices[block].tolist(), sizes[block].tolist()):
+                self.current_time = timestamp
+
+                # Update market state
+                if event_type == 1 or event_type == 4: # Limit or Trade
+                    # Update price estimate (using last trade or mid approx)
+                    self.current_price = price
+
+                if features is not None:
+                    features.update(timestamp, event_type, side, price, size)
+
+                if self._open_orders:
+                    # 1. Check for fills (Limit Orders)
+                    # Simplified: If price crosses limit, fill.
+                    # Real matching would require full LOB reconstruction.
+                    self._match_limit_orders()
+
+                    # 2. Execute Market Orders immediately
+                    self._execute_market_orders()
+                    self._open_orders = [order for order in self._open_orders if order.status == 'NEW']
+
+                # 3. Strategy Step
+                strategy_step_func(self)
+
     def _match_limit_orders(self):
         """Matches active limit orders against current price."""
-        for order in self.active_orders:
+        for order in self._open_orders:
             if order.status != 'NEW' or order.type != 'LIMIT':
                 continue
                 
@@ -91,7 +157,7 @@ class SimulationEngine:
 
     def _execute_market_orders(self):
         """Executes market orders with impact."""
-        for order in self.active_orders:
+        for order in self._open_orders:
             if order.status != 'NEW' or order.type != 'MARKET':
                 continue
             
@@ -101,14 +167,19 @@ class SimulationEngine:
             if self.impact_model:
                 # Estimate impact
                 # We assume instantaneous impact for the trade
-                # Rate is infinite for instantaneous, but we use a proxy or just the perm/temp formula
+                # Rate is infinite for instantaneous, so the order size is used as the rate proxy
                 # For simplicity: Price + Impact
-                # Impact = eta * size (simplified linear impact for single trade)
-                impact = self.impact_model.params.eta * order.size * 0.01 # Scaling factor
+                # Impact = h(size) (eta * size for the linear model)
+                impact = self.impact_model.calculate_temporary_impact(order.size, self.impact_model.params.sigma) * 0.01 # Scaling factor
                 if order.side == 1:
                     exec_price += impact
                 else:
                     exec_price -= impact
+
+            if self.transient_impact is not None:
+                # Signed impact of our earlier fills (buys push the price up)
+                exec_price += self.transient_impact.impact(self.current_time)
+                self.transient_impact.add(self.current_time, order.side * order.size)
             
             self._fill_order(order, exec_price)
 
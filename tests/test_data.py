@@ -1,8 +1,14 @@
+import os
 import pytest
 import pandas as pd
 import numpy as np
-from src.data.synthetic import generate_synthetic_lob, SyntheticLOBGenerator
+from src.data.synthetic import generate_synthetic_lob, generate_synthetic_lob_chunks, SyntheticLOBGenerator
 from src.data.loader import DataLoader
+from src.data.store import read_column_store, EventStore, external_sort
+from src.data.cache import EventCache
+from src.data.schema import price_values, from_compact, memory_report, is_compact, event_datetime
+from src.data.universe import generate_synthetic_universe
+from src.data.hawkes import HawkesParams, simulate_hawkes, hawkes_intensity
 
 def test_synthetic_generation():
     """Test that synthetic data is generated with correct shape and columns."""
@@ -56,3 +62,250 @@ def test_invalid_data():
     # Note: normalize doesn't check validity, validate does
     df = DataLoader.normalize(df)
     assert not DataLoader.validate(df)
+
+def test_vectorized_generation():
+    """Test vectorized mode matches the loop's schema and is reproducible."""
+    n_events = 1000
+    df = generate_synthetic_lob(n_events=n_events, vectorized=True, seed=7)
+    loop_df = generate_synthetic_lob(n_events=n_events, seed=7)
+
+    assert len(df) == n_events
+    assert list(df.columns) == list(loop_df.columns)
+    assert set(df['event_type'].unique()) <= {1, 3, 4}
+    assert (df['price'] > 0).all()
+    assert df['timestamp'].is_monotonic_increasing
+    assert (df['order_id'] == np.arange(n_events)).all()
+
+    # Same seed -> identical frame
+    pd.testing.assert_frame_equal(df, generate_synthetic_lob(n_events=n_events, vectorized=True, seed=7))
+
+def test_chunked_generation_matches_one_shot():
+    """Test streamed chunks concatenate to the one-shot vectorized output."""
+    df = generate_synthetic_lob(n_events=1000, vectorized=True, seed=11)
+    chunks = list(generate_synthetic_lob_chunks(n_events=1000, chunk_size=300, seed=11))
+
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+def test_universe_reproducible_across_workers():
+    """Test per-symbol seed streams make the universe independent of worker count."""
+    specs = [
+        {'symbol': 'AAA', 'initial_price': 50.0, 'volatility': 0.2},
+        {'symbol': 'BBB', 'initial_price': 200.0, 'volatility': 0.4},
+        {'symbol': 'CCC', 'initial_price': 10.0, 'volatility': 0.1},
+    ]
+    serial = generate_synthetic_universe(specs, n_events=500, seed=5, n_workers=1)
+    parallel = generate_synthetic_universe(specs, n_events=500, seed=5, n_workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert len(serial) == 1500
+    assert serial['timestamp'].is_monotonic_increasing
+
+    parts = generate_synthetic_universe(specs, n_events=500, seed=5, n_workers=1, merge=False)
+    assert set(parts) == {'AAA', 'BBB', 'CCC'}
+    assert not parts['AAA']['price'].equals(parts['BBB']['price'])
+
+def test_hawkes_generation():
+    """Test Hawkes mode: recursive intensity matches the direct sum, flow clusters."""
+    params = HawkesParams()
+    times, types = simulate_hawkes(300, params, np.random.default_rng(0))
+    assert np.all(np.diff(times) > 0)
+
+    # Direct O(n^2) evaluation of the left-limit intensities
+    lags = times[:, None] - times[None, :]
+    past = lags > 0
+    kernel = params.alpha[:, types].T[None, :, :] * np.exp(-params.beta[:, types].T[None, :, :] * lags[:, :, None])
+    direct = params.mu + np.where(past[:, :, None], kernel, 0.0).sum(axis=1)
+    assert np.allclose(hawkes_intensity(times, types, params), direct)
+
+    df = generate_synthetic_lob(n_events=5000, hawkes=params, seed=3)
+    assert len(df) == 5000
+    assert set(df['event_type'].unique()) <= {1, 3, 4}
+    gaps = np.diff(df['timestamp'])
+    assert gaps.std() / gaps.mean() > 1.0 # Overdispersed vs Poisson (CV = 1)
+
+    with pytest.raises(ValueError):
+        HawkesParams(alpha=np.full((3, 3), 0.5)) # Branching ratio 1.5
+
+def test_chunked_csv_ingestion(tmp_path):
+    """Test chunked CSV ingestion for sorted and shuffled input."""
+    df = generate_synthetic_lob(n_events=2000, vectorized=True, seed=2)
+    df.to_csv(tmp_path / "sorted.csv", index=False)
+    df.sample(frac=1, random_state=0).to_csv(tmp_path / "shuffled.csv", index=False)
+
+    for name in ["sorted", "shuffled"]:
+        chunks = list(DataLoader.iter_csv(str(tmp_path / f"{name}.csv"), chunksize=300))
+        out = pd.concat(chunks, ignore_index=True)
+        assert out['timestamp'].is_monotonic_increasing
+        assert (out['order_id'].to_numpy() == df['order_id'].to_numpy()).all()
+        assert out['size'].dtype == np.float64
+
+        store = DataLoader.csv_to_store(str(tmp_path / f"{name}.csv"), str(tmp_path / f"{name}_store"), chunksize=300)
+        stored = read_column_store(store)
+        assert np.allclose(stored['price'], df['price'])
+        assert (stored['symbol'] == 'SYM').all()
+
+    with pytest.raises(ValueError):
+        list(DataLoader.iter_csv(str(tmp_path / "shuffled.csv"), chunksize=300, assume_sorted=True))
+
+def test_external_sort_keeps_tie_order():
+    """Test equal timestamps keep input order across runs and merge blocks."""
+    def run(timestamps, first_id):
+        return pd.DataFrame({'timestamp': np.array(timestamps, dtype=float),
+                             'order_id': np.arange(first_id, first_id + len(timestamps))})
+
+    runs = [run([0, 1, 2, 5, 5, 5, 5, 5], 0), run([5, 5, 5, 6], 100), run([9, 9, 9, 9, 9], 200)]
+    out = pd.concat(list(external_sort(runs, block_size=4)), ignore_index=True)
+    expected = pd.concat(runs).sort_values('timestamp', kind='mergesort')
+    assert out['order_id'].tolist() == expected['order_id'].tolist()
+
+def test_event_cache(tmp_path):
+    """Test cached loads, fingerprint invalidation and size-capped eviction."""
+    df = generate_synthetic_lob(n_events=500, vectorized=True, seed=4)
+    csv = tmp_path / "events.csv"
+    df.to_csv(csv, index=False)
+    cache = EventCache(str(tmp_path / "cache"))
+
+    first = DataLoader.load_from_csv(str(csv), cache=cache)
+    second = DataLoader.load_from_csv(str(csv), cache=cache)
+    assert isinstance(second['price'].values, np.memmap)
+    assert np.array_equal(first['price'], df['price'])
+    assert np.allclose(second['timestamp'], df['timestamp'])
+
+    # Rewriting the source changes the fingerprint and replaces the entry
+    df.iloc[:100].to_csv(csv, index=False)
+    os.utime(csv, ns=(0, 10 ** 18))
+    assert len(DataLoader.load_from_csv(str(csv), cache=cache)) == 100
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    other = tmp_path / "other.csv"
+    df.to_csv(other, index=False)
+    cache.max_bytes = cache.size_bytes()
+    DataLoader.load_from_csv(str(other), cache=cache)
+    assert cache.get(str(csv), DataLoader.NORMALIZATION_VERSION) is None # LRU entry evicted
+    assert cache.get(str(other), DataLoader.NORMALIZATION_VERSION) is not None
+
+def test_event_cache_reports_files_in_use(tmp_path, monkeypatch):
+    """Test entries whose column files cannot be deleted (mapped on Windows) are reported and retried."""
+    df = generate_synthetic_lob(n_events=200, vectorized=True, seed=4)
+    csv = tmp_path / "events.csv"
+    df.to_csv(csv, index=False)
+    cache = EventCache(str(tmp_path / "cache"))
+    cache.put(str(csv), df)
+
+    real_remove = os.remove
+    def locked_remove(path):
+        if path.endswith('.bin'):
+            raise PermissionError(path)
+        real_remove(path)
+    monkeypatch.setattr(os, 'remove', locked_remove)
+    with pytest.warns(ResourceWarning, match='files in use'):
+        assert cache.invalidate(str(csv)) == 0
+    assert cache.get(str(csv)) is None # Never served half-deleted
+    assert cache.size_bytes() > 0 # Still counted against the cap
+
+    monkeypatch.setattr(os, 'remove', real_remove)
+    cache.max_bytes = 0
+    assert cache.evict() == 1
+    assert os.listdir(tmp_path / "cache") == []
+
+def test_event_store_range_slicing(tmp_path, monkeypatch):
+    """Test symbol/time-range queries return the right zero-copy window."""
+    monkeypatch.setattr(EventStore, 'INDEX_STRIDE', 64)
+    specs = [{'symbol': 'AAA'}, {'symbol': 'BBB'}]
+    universe = generate_synthetic_universe(specs, n_events=3000, seed=8, n_workers=1)
+    store = EventStore.build(universe.sample(frac=1, random_state=0), str(tmp_path / "store"), block_size=500)
+    assert store.symbols == ['AAA', 'BBB']
+    assert len(store) == 6000
+
+    window = store.slice(500.0, 900.0, symbol='AAA')
+    expected = universe[(universe['symbol'] == 'AAA') & (universe['timestamp'] >= 500.0) & (universe['timestamp'] < 900.0)]
+    assert np.array_equal(window['order_id'], expected['order_id'])
+    assert np.shares_memory(window['price'].to_numpy(), store.slice(symbol='AAA')['price'].to_numpy())
+
+    merged = store.slice(500.0, 900.0)
+    assert len(merged) == ((universe['timestamp'] >= 500.0) & (universe['timestamp'] < 900.0)).sum()
+    assert merged['timestamp'].is_monotonic_increasing
+
+def test_event_store_escapes_symbols(tmp_path):
+    """Test symbols with path characters stay inside the store root."""
+    df = generate_synthetic_lob(n_events=300, vectorized=True, seed=9)
+    symbols = np.array(['BRK/B', '..', '../x'])[np.arange(len(df)) % 3]
+    store = EventStore.build(df.assign(symbol=symbols), str(tmp_path / "store"))
+
+    assert sorted(store.symbols) == ['..', '../x', 'BRK/B']
+    assert sorted(os.listdir(tmp_path)) == ['store']
+    assert len(os.listdir(tmp_path / "store")) == 3
+    assert len(EventStore(str(tmp_path / "store")).slice(symbol='../x')) == 100
+
+def test_compact_schema():
+    """Test compact conversion round-trips and shrinks the footprint."""
+    df = generate_synthetic_lob(n_events=1000, vectorized=True, seed=6)
+    compact = DataLoader.normalize(df, compact=True, tick_size=0.01)
+
+    assert compact['event_type'].dtype == np.int8
+    assert compact['price'].dtype == np.int32
+    assert compact['timestamp'].dtype == np.int64
+    assert np.array_equal(price_values(compact), df['price'].to_numpy())
+
+    restored = from_compact(compact)
+    assert np.allclose(restored['timestamp'], df['timestamp'], rtol=0, atol=1e-9)
+
+    report = memory_report(df)
+    assert report.loc['per_event', 'compact'] < 0.5 * report.loc['per_event', 'standard']
+
+def test_integer_second_frames_are_standard():
+    """Test integer timestamps alone do not make a frame compact."""
+    df = pd.DataFrame({'timestamp': [1, 2, 3], 'event_type': [1, 4, 1], 'side': [1, 1, -1],
+                       'price': [100.0, 100.01, 100.02], 'size': [10.0, 5.0, 10.0]})
+    assert not is_compact(df)
+    assert list(event_datetime(df).dt.second) == [1, 2, 3]
+    assert np.array_equal(price_values(df), df['price'])
+
+def test_compact_schema_survives_store_and_cache(tmp_path):
+    """Test the tick size of compact frames is persisted by the column store."""
+    df = generate_synthetic_lob(n_events=500, vectorized=True, seed=6)
+    compact = DataLoader.normalize(df, compact=True, tick_size=0.05)
+
+    store = EventStore.build(compact, str(tmp_path / "store"), block_size=100)
+    window = store.slice(symbol=store.symbols[0])
+    assert is_compact(window) and window.attrs['tick_size'] == compact.attrs['tick_size']
+    assert np.array_equal(price_values(window), price_values(compact))
+    assert is_compact(pd.concat([window.iloc[:10], window.iloc[10:]]))
+
+    csv = tmp_path / "events.csv"
+    df.to_csv(csv, index=False)
+    cached = EventCache(str(tmp_path / "cache")).put(str(csv), compact)
+    assert np.array_equal(price_values(cached), price_values(compact))
+
+def test_validation_report():
+    """Test per-rule counts and first offending rows, whole and chunked."""
+    df = pd.DataFrame({
+        'timestamp': [1.0, 2.0, 1.5, 3.0, 4.0, 5.0],
+        'event_type': [1, 4, 9, 3, 1, 4],
+        'side': [1, -1, 1, 0, -1, 1],
+        'price': [100.0, 101.0, 100.5, -1.0, 100.0, 100.0],
+        'size': [10, 5, 5, 5, 0, 5],
+    })
+    report = DataLoader.validate(df)
+
+    assert not report
+    assert report.counts['non_monotonic_timestamp'] == 1
+    assert report.first_row['non_monotonic_timestamp'] == 2
+    assert report.first_row['unknown_event_type'] == 2
+    assert report.first_row['invalid_side'] == 3
+    assert report.first_row['non_positive_price'] == 3
+    assert report.first_row['non_positive_size'] == 4
+    assert report.counts['missing_value'] == 0
+
+    chunked = DataLoader.validate_chunks([df.iloc[:2], df.iloc[2:4], df.iloc[4:]])
+    assert chunked.counts == report.counts
+    assert chunked.first_row == report.first_row
+
+    # NaN codes are missing values (and not valid codes)
+    codes = df.astype({'event_type': float, 'side': float})
+    codes.loc[1, 'event_type'] = np.nan
+    codes.loc[5, 'side'] = np.nan
+    report = DataLoader.validate(codes)
+    assert report.counts['missing_value'] == 2
+    assert report.first_row['missing_value'] == 1
@@ -1,10 +1,19 @@
 import pytest
+import functools
+import importlib
+import multiprocessing
 import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.tree import DecisionTreeClassifier
 from src.evaluation.backtest import BacktestRunner
 from src.evaluation.metrics import ExecutionMetrics
 from src.execution.strategies import TWAPStrategy
 from src.impact_models.parametric import AlmgrenChrissModel, ImpactParams
 from src.simulation.engine import Trade
+from src.data.loader import DataLoader
+from src.evaluation.walk_forward import walk_forward
+from src.impact_models.prediction import BACKENDS
 
 @pytest.fixture
 def sample_data():
@@ -46,3 +55,69 @@ def test_backtest_runner(sample_data):
     
     trades = runner.run(TWAPStrategy, strategy_params)
     assert len(trades) == 2
+
+def test_market_vwap_compact_schema():
+    data = pd.DataFrame({
+        'timestamp': [1.0, 2.0, 3.0],
+        'event_type': [4, 1, 4],
+        'side': [1, -1, -1],
+        'price': [100.0, 100.5, 101.0],
+        'size': [10, 5, 30],
+    })
+    compact = DataLoader.normalize(data, compact=True)
+
+    # (100 * 10 + 101 * 30) / 40 = 100.75
+    assert ExecutionMetrics.calculate_market_vwap(data) == 100.75
+    assert ExecutionMetrics.calculate_market_vwap(compact) == 100.75
+
+def test_walk_forward_persists_models(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 3000
+    ofi, tfi = rng.normal(size=n), rng.normal(size=n)
+    next_move = np.roll(ofi + rng.normal(size=n), 1)
+    price = 100 + np.cumsum(np.where(np.abs(next_move) < 0.3, 0, np.sign(next_move)) * 0.01)
+    df = pd.DataFrame({'ofi': ofi, 'tfi': tfi, 'price': price})
+
+    first = walk_forward(df, n_folds=3, model_dir=str(tmp_path))
+    assert len(first) == 3
+    assert not first['cached'].any()
+    assert (first['accuracy'] > 0.4).all()
+
+    rerun = walk_forward(df, n_folds=3, model_dir=str(tmp_path))
+    assert rerun['cached'].all()
+    assert np.allclose(rerun['accuracy'], first['accuracy'])
+
+    # Different hyperparameters are separate models
+    other = walk_forward(df, n_folds=3, model_params={'C': 0.1}, model_dir=str(tmp_path), train_size=1000)
+    assert not other['cached'].any()
+    assert (other['train_rows'] <= 1000).all()
+
+def test_walk_forward_lightgbm_backend():
+    pytest.importorskip('lightgbm')
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'ofi': rng.normal(size=2000),
+        'tfi': rng.normal(size=2000),
+        'price': 100 + np.cumsum(rng.choice([-1, 0, 1], size=2000) * 0.01),
+    })
+    results = walk_forward(df, n_folds=2, backend='lightgbm', model_params={'n_estimators': 20}, n_workers=2)
+    assert len(results) == 2
+    assert results['accuracy'].between(0, 1).all()
+
+def _shallow_tree(**params):
+    return DecisionTreeClassifier(max_depth=3, random_state=0, **params)
+
+def test_walk_forward_custom_backend_spawned_workers(monkeypatch):
+    """Test registered backends reach workers started with spawn (Windows/macOS default)."""
+    spawn = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn'))
+    monkeypatch.setattr(importlib.import_module('src.evaluation.walk_forward'), 'ProcessPoolExecutor', spawn)
+    monkeypatch.setitem(BACKENDS, 'shallow_tree', _shallow_tree)
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'ofi': rng.normal(size=1000),
+        'tfi': rng.normal(size=1000),
+        'price': 100 + np.cumsum(rng.choice([-1, 0, 1], size=1000) * 0.01),
+    })
+    parallel = walk_forward(df, n_folds=2, backend='shallow_tree', n_workers=2)
+    serial = walk_forward(df, n_folds=2, backend=_shallow_tree, n_workers=1)
+    assert np.allclose(parallel['accuracy'], serial['accuracy'])
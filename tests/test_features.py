@@ -3,6 +3,16 @@ import pandas as pd
 import numpy as np
 from src.features.microstructure import MicrostructureFeatures
 from src.features.volatility import VolatilityFeatures
+from src.features.book import OrderBookReconstructor
+from src.data.loader import DataLoader
+from src.data.synthetic import generate_synthetic_lob
+from src.execution.strategies import VWAPStrategy
+from src.features.online import OnlineFeatureEngine
+from src.features.realized import RealizedVolatilityFeatures
+from src.features.horizons import MultiHorizonFeatures
+from src.features.bars import BarBuilder
+from src.features.cache import FeatureCache, fingerprint
+from src.features.volume_curve import VolumeCurveEstimator
 
 @pytest.fixture
 def sample_data():
@@ -58,3 +68,317 @@ def test_volume_profile(sample_data):
     vp = VolatilityFeatures.calculate_volume_profile(sample_data, time_window='10s')
     # Total volume traded = 5 + 5 = 10
     assert vp.iloc[0] == 10
+
+def test_features_accept_chunks(sample_data):
+    chunks = [sample_data.iloc[:3], sample_data.iloc[3:]]
+
+    ofi = MicrostructureFeatures.calculate_ofi(iter(chunks), time_window='10s')
+    tfi = MicrostructureFeatures.calculate_tfi(iter(chunks), time_window='10s')
+    vp = VolatilityFeatures.calculate_volume_profile(iter(chunks), time_window='10s')
+
+    assert ofi['ofi'].iloc[0] == -5
+    assert tfi['tfi'].iloc[0] == 0
+    assert vp.iloc[0] == 10
+
+def test_chunked_buckets_span_days():
+    """Test chunked features match one-shot ones across days with a window that does not divide a day."""
+    rng = np.random.default_rng(3)
+    n = 600
+    df = pd.DataFrame({
+        'timestamp': np.sort(rng.uniform(0, 3 * 86400, n)),
+        'event_type': rng.choice([1, 3, 4], n),
+        'side': rng.choice([-1, 1], n),
+        'price': 100 + rng.integers(-5, 6, n) * 0.01,
+        'size': rng.integers(1, 100, n).astype(float),
+    })
+    days = [df[(df['timestamp'] >= d * 86400) & (df['timestamp'] < (d + 1) * 86400)] for d in range(3)]
+
+    pd.testing.assert_frame_equal(MicrostructureFeatures.calculate_ofi(iter(days), time_window='7s'),
+                                  MicrostructureFeatures.calculate_ofi(df, time_window='7s'), check_dtype=False)
+    pd.testing.assert_frame_equal(MicrostructureFeatures.calculate_tfi(iter(days), time_window='7s'),
+                                  MicrostructureFeatures.calculate_tfi(df, time_window='7s'), check_dtype=False)
+    pd.testing.assert_series_equal(VolatilityFeatures.calculate_volume_profile(iter(days), time_window='7s'),
+                                   VolatilityFeatures.calculate_volume_profile(df, time_window='7s'), check_dtype=False)
+
+def test_features_accept_compact_schema(sample_data):
+    compact = DataLoader.normalize(sample_data, compact=True)
+
+    ofi = MicrostructureFeatures.calculate_ofi(compact, time_window='10s')
+    tfi = MicrostructureFeatures.calculate_tfi(compact, time_window='10s')
+
+    assert ofi['ofi'].iloc[0] == -5
+    assert tfi['tfi'].iloc[0] == 0
+
+def test_spread_from_book_reconstruction(sample_data):
+    # t=1 bid 10 @ 100, t=2 ask 10 @ 101, t=3 buy 5 sweeps the ask,
+    # t=4 deletes order 1 (the bid), t=5 sell finds no bids
+    spread = MicrostructureFeatures.calculate_spread(sample_data)
+    assert np.isnan(spread.iloc[0])
+    assert spread.iloc[1] == 1.0
+    assert spread.iloc[2] == 1.0
+    assert np.isnan(spread.iloc[3])
+
+    book = MicrostructureFeatures.reconstruct_book(sample_data)
+    assert book['ask_size'].iloc[2] == 5
+    assert book['bid_depth'].iloc[1] == 10
+    assert book['depth_imbalance'].iloc[1] == 0.0
+
+def test_book_reconstruction_lobster_events():
+    events = pd.DataFrame({
+        'timestamp': np.arange(1.0, 9.0),
+        'event_type': [1, 1, 1, 1, 2, 4, 3, 1],
+        'side':       [1, 1, -1, -1, 1, -1, 1, 1],
+        'price':      [99.98, 99.99, 100.01, 100.02, 99.99, 100.01, 99.99, 100.02],
+        'size':       [100, 50, 30, 70, 20, 30, 30, 80],
+        'order_id':   [1, 2, 3, 4, 2, 3, 2, 5],
+    })
+    reconstructor = OrderBookReconstructor(depth_levels=3)
+    first = reconstructor.update(events.iloc[:5])
+    book = pd.concat([first, reconstructor.update(events.iloc[5:])])
+
+    # Partial cancel of order 2 leaves 30 at the bid
+    assert book['bid_price'].iloc[4] == 99.99
+    assert book['bid_size'].iloc[4] == 30
+    # Order 3 fully executed: ask moves to 100.02
+    assert book['ask_price'].iloc[5] == 100.02
+    # Order 2 deleted: bid falls back to 99.98, 3-tick depth = 100
+    assert book['bid_price'].iloc[6] == 99.98
+    assert book['bid_depth'].iloc[6] == 100
+    # Crossing buy 80 @ 100.02 takes the 70 ask and rests 10 at 100.02
+    assert book['bid_price'].iloc[7] == 100.02
+    assert book['bid_size'].iloc[7] == 10
+    assert np.isnan(book['ask_price'].iloc[7])
+
+def test_book_prices_stable_when_levels_grow_below():
+    events = pd.DataFrame({
+        'timestamp': [1.0, 2.0, 3.0],
+        'event_type': [1, 1, 1],
+        'side': [1, -1, 1],
+        'price': [100.00, 100.05, 50.00],
+        'size': [10, 10, 10],
+    })
+    one_shot = OrderBookReconstructor.reconstruct(events)
+    chunked = OrderBookReconstructor()
+    split = pd.concat([chunked.update(events.iloc[:2]), chunked.update(events.iloc[2:])])
+
+    # Rows sampled before the array grows downwards keep their prices
+    assert list(one_shot['bid_price']) == [100.0, 100.0, 100.0]
+    assert list(one_shot['ask_price'].iloc[1:]) == [100.05, 100.05]
+    pd.testing.assert_frame_equal(one_shot, split)
+
+def test_book_delete_after_sweep():
+    events = pd.DataFrame({
+        'timestamp': np.arange(1.0, 8.0),
+        'event_type': [1, 1, 1, 1, 3, 4, 2],
+        'side':       [-1, -1, 1, -1, -1, 1, -1],
+        'price':      [100.01, 100.01, 100.01, 100.01, 100.01, 100.02, 100.01],
+        'size':       [50, 20, 60, 40, 50, 10, 20],
+        'order_id':   [1, 6, 2, 3, 1, 7, 6],
+    })
+    book = OrderBookReconstructor.reconstruct(events)
+
+    # Crossing buy 60 fills order 1 and 10 of order 6; deleting order 1 later is a no-op
+    assert book['ask_size'].iloc[4] == 50
+    # Unknown-id execution of 10 takes the rest of order 6, so its cancel changes nothing
+    assert book['ask_size'].iloc[5] == 40
+    assert book['ask_size'].iloc[6] == 40
+
+def test_shared_buckets_match_resample():
+    df = generate_synthetic_lob(n_events=5000, vectorized=True, seed=5)
+    buckets = MicrostructureFeatures.bucket_index(df, time_window='5s')
+
+    ofi = MicrostructureFeatures.calculate_ofi(df, buckets=buckets, method='events')
+    tfi = MicrostructureFeatures.calculate_tfi(df, buckets=buckets)
+
+    dt = pd.to_datetime(df['timestamp'], unit='s')
+    signed = np.where(df['event_type'] == 1, df['size'], -df['size'])
+    expected_bid = pd.Series(np.where(df['side'] == 1, signed, 0), index=dt).resample('5s').sum()
+    trades = df['event_type'] == 4
+    expected_tfi = pd.Series(np.where(df['side'] == 1, df['size'], -df['size'])[trades],
+                             index=dt[trades]).resample('5s').sum()
+
+    assert (ofi.index == expected_bid.index).all()
+    assert np.array_equal(ofi['bid_flow'].values, expected_bid.values)
+    assert np.array_equal(tfi['tfi'].values, expected_tfi.values)
+
+def test_best_quote_ofi():
+    quotes = pd.DataFrame({
+        'timestamp': [1.0, 2.0, 3.0, 4.0],
+        'event_type': [1, 1, 1, 1],
+        'side': [1, 1, -1, 1],
+        'price': [100.0, 100.0, 101.0, 100.01],
+        'size': [10, 5, 8, 3],
+        'bid_price': [100.0, 100.0, 100.0, 100.01],
+        'ask_price': [101.0, 101.0, 101.0, 101.0],
+        'bid_size': [10, 15, 15, 3],
+        'ask_size': [8, 8, 16, 16],
+    })
+    ofi = MicrostructureFeatures.calculate_ofi(quotes, time_window='10s')
+
+    # Bid: +5 (size up at same price), +3 (improved price) -> 8
+    # Ask: +8 (size up at same price) -> 8
+    assert ofi['bid_flow'].iloc[0] == 8
+    assert ofi['ask_flow'].iloc[0] == 8
+    assert ofi['ofi'].iloc[0] == 0
+
+    events = MicrostructureFeatures.calculate_ofi(quotes, time_window='10s', method='events')
+    assert events['ofi'].iloc[0] == 18 - 8
+
+    # Chunk boundaries do not drop the first quote change of a chunk
+    chunks = [quotes.iloc[:1], quotes.iloc[1:3], quotes.iloc[3:]]
+    chunked = MicrostructureFeatures.calculate_ofi(iter(chunks), time_window='2s')
+    pd.testing.assert_frame_equal(chunked, MicrostructureFeatures.calculate_ofi(quotes, time_window='2s'),
+                                  check_dtype=False)
+
+def test_multi_horizon_features():
+    df = generate_synthetic_lob(n_events=3000, vectorized=True, seed=9)
+    wide = MultiHorizonFeatures.calculate(df, windows=['1s', '5s'])
+
+    assert list(wide.columns) == ['ofi_1s', 'ofi_5s', 'tfi_1s', 'tfi_5s', 'volume_1s', 'volume_5s']
+
+    ofi = MicrostructureFeatures.calculate_ofi(df, time_window='1s')
+    volume = VolatilityFeatures.calculate_volume_profile(df, time_window='1s').reindex(wide.index, fill_value=0)
+    assert np.array_equal(wide['ofi_1s'].values, ofi['ofi'].values)
+    assert np.array_equal(wide['volume_1s'].values, volume.values)
+    # Coarser windows trail the fine grid
+    assert np.array_equal(wide['ofi_5s'].values, ofi['ofi'].rolling(5, min_periods=1).sum().values)
+
+def test_online_features_match_batch():
+    df = generate_synthetic_lob(n_events=3000, vectorized=True, seed=4)
+    online = OnlineFeatureEngine(time_window='2s', vol_window=10, keep_history=True)
+    vols = []
+    for row in df.itertuples():
+        online.update(row.timestamp, row.event_type, row.side, row.price, row.size)
+        vols.append(online.realized_volatility)
+
+    history = online.history_frame(include_current=True)
+    ofi = MicrostructureFeatures.calculate_ofi(df, time_window='2s')
+    tfi = MicrostructureFeatures.calculate_tfi(df, time_window='2s')
+    assert (history.index == ofi.index).all()
+    assert np.allclose(history[['bid_flow', 'ask_flow', 'ofi']].values, ofi.values)
+    assert np.allclose(history['tfi'].reindex(tfi.index).values, tfi['tfi'].values)
+    assert online.last_ofi == ofi['ofi'].iloc[-2]
+
+    observed = df['event_type'].isin([1, 4])
+    batch_vol = VolatilityFeatures.calculate_realized_volatility(df.loc[observed, 'price'], window=10)
+    assert np.allclose(np.array(vols)[observed.values], batch_vol.values, equal_nan=True)
+
+def test_online_volatility_does_not_drift():
+    # Large returns for a long stream, then a quiet window: running sums alone would drift
+    rng = np.random.default_rng(0)
+    n = 100_003
+    returns = np.where(np.arange(n) < n - 100, rng.normal(0, 0.05, n), rng.normal(0, 1e-7, n))
+    prices = 100 * np.cumprod(1 + returns)
+    online = OnlineFeatureEngine(vol_window=20)
+    for k, price in enumerate(prices.tolist()):
+        online.update(float(k), 4, 1, price, 1.0)
+
+    exact = pd.Series(prices).pct_change().iloc[-20:].std()
+    assert abs(online.realized_volatility / exact - 1) < 1e-9
+
+def test_realized_estimator_suite():
+    df = generate_synthetic_lob(n_events=4000, vectorized=True, seed=8)
+    suite = RealizedVolatilityFeatures.calculate(df, windows=[10, 50], subsample=3, volatility=False)
+    log_price = np.log(df.loc[df['event_type'] == 4, 'price'].values)
+
+    assert suite['rv_10'].iloc[:10].isna().all()
+    i = 200
+    window = log_price[i - 50:i + 1]
+    returns = np.diff(window)
+    assert np.isclose(suite['rv_50'].iloc[i], (returns ** 2).sum())
+    assert np.isclose(suite['bipower_50'].iloc[i], np.pi / 2 * (np.abs(returns[1:]) * np.abs(returns[:-1])).sum())
+    assert np.isclose(suite['subsampled_50'].iloc[i], ((window[3:] - window[:-3]) ** 2).sum() / 3)
+
+    calendar = RealizedVolatilityFeatures.calculate(df, windows=['30s'], clock='calendar', estimators=['rv'])
+    volume = RealizedVolatilityFeatures.calculate(df, windows=[1000], clock='volume', estimators=['rv'])
+    assert len(calendar) == len(volume) == len(log_price)
+    assert (calendar['rv_30s'].dropna() >= 0).all()
+
+def test_volume_bars_carry_across_chunks():
+    df = generate_synthetic_lob(n_events=5000, vectorized=True, seed=6)
+    bars = BarBuilder.build(df, bar_type='volume', threshold=1000)
+    chunked = BarBuilder.build((df.iloc[i:i + 333] for i in range(0, len(df), 333)),
+                               bar_type='volume', threshold=1000)
+
+    pd.testing.assert_frame_equal(bars, chunked)
+    trades = df[df['event_type'] == 4]
+    assert bars['n_trades'].sum() == len(trades)
+    assert bars['volume'].sum() == trades['size'].sum()
+    # Every complete bar crosses a new multiple of the threshold
+    assert (np.diff(bars['volume'].cumsum().iloc[:-1].values // 1000) >= 1).all()
+    assert ((bars['low'] - 1e-9 <= bars['vwap']) & (bars['vwap'] <= bars['high'] + 1e-9)).all()
+
+def test_dollar_bars_carry_across_chunks():
+    # Notional 0.1 per trade: every 10th trade reaches a multiple of 1.0 exactly, up to rounding
+    n = 50_000
+    df = pd.DataFrame({'timestamp': np.arange(n) * 0.001, 'event_type': 4, 'side': 1, 'price': 0.1, 'size': 1.0})
+    bars = BarBuilder.build(df, bar_type='dollar', threshold=1.0)
+    chunked = BarBuilder.build((df.iloc[i:i + 777] for i in range(0, n, 777)), bar_type='dollar', threshold=1.0)
+
+    pd.testing.assert_frame_equal(bars, chunked)
+    assert len(bars) == n // 10
+    assert (bars['n_trades'] == 10).all()
+
+def test_tick_bars(sample_data):
+    bars = BarBuilder.build(sample_data, bar_type='tick', threshold=1)
+    # Trades at t=3 (buy 5 @ 101) and t=5 (sell 5 @ 100)
+    assert list(bars['close']) == [101.0, 100.0]
+    assert list(bars['signed_volume']) == [5.0, -5.0]
+
+def test_volume_curve_across_days():
+    day = 86400.0
+    rows = []
+    for d in range(5):
+        # Morning bin trades 300, afternoon bin 100, except one abnormal day
+        afternoon = 5000 if d == 2 else 100
+        rows += [(d * day + 36000.0, 4, 1, 100.0, 300), (d * day + 50000.0, 4, -1, 100.0, afternoon)]
+    df = pd.DataFrame(rows, columns=['timestamp', 'event_type', 'side', 'price', 'size'])
+
+    estimator = VolumeCurveEstimator(n_bins=2, session=(32400.0, 57600.0), method='median', n_workers=2)
+    curve = estimator.estimate(df, lookback=5)
+    assert np.allclose(curve, [0.75, 0.25])
+    assert estimator.estimate(df, lookback=5) is curve
+
+    # Only the two most recent days (no outlier)
+    assert np.allclose(estimator.estimate(df, lookback=2), [0.75, 0.25])
+    trimmed = VolumeCurveEstimator(n_bins=2, session=(32400.0, 57600.0), method='trimmed', trim=0.2)
+    assert np.allclose(trimmed.estimate(df), [0.75, 0.25])
+
+    strategy = VWAPStrategy(total_size=100, duration=10.0, start_time=0.0, volume_profile=curve)
+    assert np.allclose(strategy.schedule, [75.0, 25.0])
+
+    # Same last day, different data: no stale cache hit; a trade at the session end counts
+    shifted = df.assign(timestamp=df['timestamp'].where(df['timestamp'] % day != 50000.0, df['timestamp'] + 7600.0))
+    assert np.allclose(estimator.estimate(shifted, lookback=5), [0.75, 0.25])
+    doubled = df.assign(size=np.where(df['timestamp'] % day == 50000.0, 300, df['size']))
+    assert np.allclose(estimator.estimate(doubled, lookback=5), [0.5, 0.5])
+
+def test_feature_cache(sample_data, tmp_path):
+    cache = FeatureCache(max_entries=2, disk_dir=str(tmp_path))
+    first = cache.compute(MicrostructureFeatures.calculate_ofi, sample_data, time_window='10s')
+    second = cache.compute(MicrostructureFeatures.calculate_ofi, sample_data, time_window='10s')
+    pd.testing.assert_frame_equal(first, second)
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    # Different parameters or data are different entries
+    cache.compute(MicrostructureFeatures.calculate_ofi, sample_data, time_window='1s')
+    changed = sample_data.assign(size=sample_data['size'] * 2)
+    assert cache.compute(MicrostructureFeatures.calculate_ofi, changed, time_window='10s')['ofi'].iloc[0] == -10
+    assert cache.stats.misses == 3
+    assert cache.stats.evictions == 1
+
+    # Evicted from memory, served from disk (also by a fresh cache)
+    fresh = FeatureCache(disk_dir=str(tmp_path))
+    fresh.compute(MicrostructureFeatures.calculate_ofi, sample_data, time_window='10s')
+    assert fresh.stats.disk_hits == 1
+
+    # Chunk iterators are not cached
+    cache.compute(MicrostructureFeatures.calculate_ofi, iter([sample_data]), time_window='10s')
+    assert cache.stats.bypassed == 1
+
+    # Compact frames differing only in tick size are different data
+    coarse = DataLoader.normalize(sample_data, compact=True, tick_size=0.01)
+    fine = coarse.copy()
+    fine.attrs['tick_size'] = {'': 0.001}
+    assert fingerprint(coarse) != fingerprint(fine)
+    assert fingerprint(coarse) == fingerprint(coarse.copy())
@@ -1,8 +1,12 @@
 import pytest
 import numpy as np
 import pandas as pd
+from sklearn.linear_model import LogisticRegression
 from src.impact_models.parametric import AlmgrenChrissModel, ImpactParams
-from src.impact_models.prediction import PricePredictor
+from src.impact_models.prediction import PricePredictor, CompiledPredictor
+from src.impact_models.calibration import calibrate_impact
+from src.impact_models.propagator import PropagatorModel, PropagatorParams
+from src.impact_models.surface import ImpactSurface
 
 def test_almgren_chriss():
     params = ImpactParams(eta=0.1, gamma=0.01)
@@ -26,6 +30,104 @@ def test_almgren_chriss():
     # Cost = 0.5 * 10.0 * 1000 + 10.0 * 1000 = 5000 + 10000 = 15000
     assert cost == 15000
 
+def test_almgren_chriss_broadcasts():
+    model = AlmgrenChrissModel(ImpactParams(eta=0.1, gamma=0.01))
+    sizes = np.array([[1000.0], [2000.0]])
+    horizons = np.array([10.0, 20.0, 0.0])
+    costs = model.estimate_cost(sizes, horizons)
+    assert costs.shape == (2, 3)
+    assert costs[0, 0] == 15000
+    assert np.isinf(costs[:, 2]).all()
+
+def test_optimal_trajectory():
+    model = AlmgrenChrissModel(ImpactParams(eta=0.1, gamma=0.01, sigma=0.5))
+    holdings = model.optimal_trajectory(size=1000, time_horizon=10, n_steps=10, risk_aversion=[0.0, 1.0])
+    assert holdings.shape == (2, 11)
+    assert np.allclose(holdings[:, 0], 1000) and np.allclose(holdings[:, -1], 0)
+
+    # Risk neutral: TWAP, whose cost matches estimate_cost
+    assert np.allclose(holdings[0], np.linspace(1000, 0, 11))
+    expected, variance = model.trajectory_cost(holdings, 10)
+    assert np.isclose(expected[0], model.estimate_cost(1000, 10))
+
+    # Closed form sinh ratio
+    kappa = np.sqrt(1.0 * 0.5 ** 2 / 0.1)
+    t = np.linspace(0, 10, 11)
+    assert np.allclose(holdings[1], 1000 * np.sinh(kappa * (10 - t)) / np.sinh(kappa * 10))
+
+    # Efficient frontier: more risk aversion trades cost for variance
+    frontier = model.efficient_frontier(1000, 10, np.logspace(-3, 1, 5))
+    assert (np.diff(frontier['expected_cost']) > 0).all()
+    assert (np.diff(frontier['variance']) < 0).all()
+
+def test_power_law_calibration():
+    rng = np.random.default_rng(0)
+    size = rng.lognormal(8, 1, 400)
+    duration = rng.uniform(60, 3600, 400)
+    metaorders = pd.DataFrame({
+        'size': size,
+        'duration': duration,
+        'temporary_impact': 0.05 * (size / duration) ** 0.5 * np.exp(rng.normal(0, 0.1, 400)),
+        'permanent_impact': 0.001 * size ** 0.6 * np.exp(rng.normal(0, 0.1, 400)),
+    })
+
+    result = calibrate_impact(metaorders, n_bootstrap=100, seed=3)
+    assert abs(result.params.alpha - 0.5) < 0.02
+    assert abs(result.params.beta - 0.6) < 0.02
+    low, high = result.intervals['alpha']
+    assert low < result.params.alpha < high
+    assert len(result.samples) == 100
+
+    # Square-root law model: impact grows with sqrt(rate)
+    model = AlmgrenChrissModel(result.params)
+    ratio = model.calculate_temporary_impact(400.0, 0.02) / model.calculate_temporary_impact(100.0, 0.02)
+    assert abs(ratio - 2.0) < 0.1
+
+def test_calibration_counts_and_parallel_bootstrap():
+    rng = np.random.default_rng(4)
+    size = rng.lognormal(8, 1, 200)
+    metaorders = pd.DataFrame({
+        'size': size,
+        'duration': rng.uniform(60, 3600, 200),
+        'temporary_impact': 0.05 * size ** 0.5 * np.exp(rng.normal(0, 0.1, 200)),
+        'permanent_impact': 0.001 * size ** 0.6 * np.exp(rng.normal(0, 0.1, 200)),
+    })
+    metaorders.loc[:9, 'temporary_impact'] = -1.0
+    metaorders.loc[10:14, 'permanent_impact'] = np.nan
+    metaorders.loc[15, 'duration'] = 0.0
+
+    serial = calibrate_impact(metaorders, n_bootstrap=150, seed=7, n_workers=1)
+    assert serial.n_obs == {'temporary': 189, 'permanent': 195}
+
+    # Batches draw from their own spawned streams, so workers do not change the result
+    parallel = calibrate_impact(metaorders, n_bootstrap=150, seed=7, n_workers=2)
+    pd.testing.assert_frame_equal(serial.samples, parallel.samples)
+    assert serial.intervals == parallel.intervals
+
+def test_propagator_fft_matches_direct_sum():
+    volumes = np.random.default_rng(1).normal(0, 100, 200)
+    for kernel in ['exponential', 'power_law']:
+        model = PropagatorModel(PropagatorParams(kernel=kernel, timescale=5.0, volume_exponent=0.5))
+        path = model.impact_path(volumes, dt=2.0)
+        flow = model.volume_response(volumes)
+        direct = [np.dot(model.kernel((k - np.arange(k + 1)) * 2.0), flow[:k + 1]) for k in range(len(volumes))]
+        assert np.allclose(path, direct)
+
+        state = model.state()
+        incremental = [state.add(k * 2.0, v) for k, v in enumerate(volumes)]
+        assert np.allclose(incremental, direct)
+
+def test_power_law_state_is_bounded():
+    model = PropagatorModel(PropagatorParams(kernel='power_law', timescale=5.0, decay_exponent=0.4))
+    volumes = np.random.default_rng(2).normal(0, 100, 20000)
+    state = model.state()
+    incremental = np.array([state.add(k * 1.0, v) for k, v in enumerate(volumes)])
+
+    # Constant state size however many fills, and the FFT path agrees over the whole run
+    assert len(state.levels) == len(model.exponential_sum()[0]) < 200
+    path = model.impact_path(volumes, dt=1.0)
+    assert np.allclose(incremental, path, rtol=0, atol=1e-8 * np.abs(path).max())
+
 def test_price_predictor():
     predictor = PricePredictor()
     
@@ -43,3 +145,76 @@ def test_price_predictor():
     probs = predictor.predict_proba(np.array([[0.1, 0.1]]))
     assert probs.shape == (1, 3)
     assert np.isclose(probs.sum(), 1.0)
+
+def test_price_predictor_incremental():
+    rng = np.random.default_rng(0)
+    n = 50000
+    ofi, tfi = rng.normal(size=n), rng.normal(size=n)
+    next_move = np.roll(0.5 * ofi + 0.2 * tfi + rng.normal(size=n), 1)
+    price = 100 + np.cumsum(np.where(np.abs(next_move) < 0.3, 0, np.sign(next_move)) * 0.01)
+    df = pd.DataFrame({'ofi': ofi, 'tfi': tfi, 'price': price})
+
+    batch = PricePredictor()
+    batch.train(df)
+    online = PricePredictor(seed=0)
+    online.train_incremental(df.iloc[i:i + 5000] for i in range(0, n, 5000))
+
+    assert online.is_trained
+    # Every row but the very last was used, across chunk boundaries
+    assert np.isclose(online.scaler.n_samples_seen_, n - 1)
+    X = np.array([[1.0, 0.0], [-1.0, 0.0], [0.0, 0.0]])
+    assert np.allclose(online.predict_proba(X), batch.predict_proba(X), atol=0.03)
+
+def test_compiled_inference_matches_sklearn():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'ofi': rng.normal(size=2000) * 3 + 1,
+        'tfi': rng.normal(size=2000) - 2,
+        'price': 100 + np.cumsum(rng.choice([-1, 0, 1], size=2000) * 0.01),
+    })
+    predictor = PricePredictor()
+    assert np.allclose(predictor.predict_row(np.zeros(2)), 1 / 3)
+    predictor.train(df)
+
+    X = rng.normal(size=(500, 2)) * 3
+    expected = predictor.predict_proba(X)
+    assert np.allclose(predictor.compile().predict_batch(X), expected, rtol=0, atol=1e-9)
+    rows = np.array([predictor.predict_row(x).copy() for x in X])
+    assert np.allclose(rows, expected, rtol=0, atol=1e-9)
+
+    # Binary sklearn model (single logit)
+    y = (X[:, 0] + rng.normal(size=500) > 0).astype(int)
+    binary = LogisticRegression().fit(predictor.scaler.transform(X), y)
+    compiled = CompiledPredictor.from_model(predictor.scaler, binary)
+    assert np.allclose(compiled.predict_batch(X), binary.predict_proba(predictor.scaler.transform(X)), rtol=0, atol=1e-9)
+
+def test_impact_surface_matches_model():
+
+    class VolScaledModel(AlmgrenChrissModel):
+        def calculate_temporary_impact(self, rate, volatility):
+            return self.params.eta * np.sqrt(volatility) * np.sign(rate) * np.abs(rate) ** self.params.alpha * np.exp(-volatility)
+
+    model = VolScaledModel(ImpactParams(eta=0.1, gamma=0.01, alpha=0.5, beta=0.6))
+    surface = ImpactSurface(model, tolerance=1e-5)
+    assert surface.max_error <= 1e-5
+    assert surface.verify(n_samples=20000, seed=0) < 1e-4
+
+    rates = np.array([-250.0, 0.0, 3.0, 1e7]) # Sell, zero and out-of-range rates
+    assert np.allclose(surface.calculate_temporary_impact(rates, 0.02),
+                       model.calculate_temporary_impact(rates, 0.02), rtol=1e-4, atol=0)
+    assert np.isclose(surface.calculate_temporary_impact(-250.0, 0.02),
+                      model.calculate_temporary_impact(-250.0, 0.02), rtol=1e-4)
+
+    sizes = np.array([10.0, 5000.0])
+    expected = model.calculate_temporary_impact(sizes / 60, 0.3) + model.calculate_permanent_impact(sizes)
+    assert np.allclose(surface.lookup(sizes, sizes / 60, 0.3), expected, rtol=1e-4)
+
+def test_impact_surface_keeps_closed_form_power_laws():
+    model = AlmgrenChrissModel(ImpactParams(eta=0.1, gamma=0.01, alpha=0.5, beta=0.6))
+    surface = ImpactSurface(model)
+    assert surface.exact_temporary and surface.exact_permanent
+    assert surface.temp_table is None and surface.perm_table is None
+
+    rates = np.array([-250.0, 3.0, 1e7])
+    assert np.array_equal(surface.calculate_temporary_impact(rates, 0.02), model.calculate_temporary_impact(rates, 0.02))
+    assert surface.calculate_permanent_impact(-40.0) == model.calculate_permanent_impact(-40.0)
@@ -1,8 +1,14 @@
 import pytest
 import pandas as pd
+import numpy as np
+import src.simulation.engine as engine_module
 from src.simulation.engine import SimulationEngine
+from src.data.loader import DataLoader
+from src.features.online import OnlineFeatureEngine
 from src.execution.strategies import TWAPStrategy
 from src.impact_models.parametric import AlmgrenChrissModel, ImpactParams
+from src.impact_models.propagator import PropagatorModel, PropagatorParams
+from src.impact_models.surface import ImpactSurface
 
 @pytest.fixture
 def sample_data():
@@ -53,3 +59,87 @@ def test_market_impact_execution(sample_data):
     assert len(engine.trades) == 1
     assert engine.trades[0].price > 100.0
     assert engine.trades[0].price == 100.1
+
+def test_engine_consumes_chunks(sample_data):
+    chunks = [sample_data.iloc[:2], sample_data.iloc[2:]]
+    engine = SimulationEngine(iter(chunks))
+    strategy = TWAPStrategy(total_size=10, duration=5.0, start_time=0.0, n_slices=2)
+
+    engine.run(strategy.on_step)
+
+    assert engine.current_time == 5.0
+    assert len(engine.trades) == 2
+
+def test_engine_accepts_compact_schema(sample_data):
+    compact = DataLoader.normalize(sample_data, compact=True)
+    engine = SimulationEngine(compact)
+    strategy = TWAPStrategy(total_size=10, duration=5.0, start_time=0.0, n_slices=2)
+
+    engine.run(strategy.on_step)
+
+    assert engine.current_time == 5.0
+    assert [t.price for t in engine.trades] == [100.0, 100.0]
+
+def test_engine_integer_second_timestamps():
+    df = pd.DataFrame({'timestamp': [1, 2, 3], 'event_type': [1, 4, 1], 'side': [1, 1, -1],
+                       'price': [100.0, 100.0, 100.0], 'size': [10.0, 5.0, 10.0]})
+    engine = SimulationEngine(df)
+    engine.run(lambda eng: None)
+    assert engine.current_time == 3.0
+
+def test_engine_updates_online_features(sample_data):
+    features = OnlineFeatureEngine(time_window='10s', vol_window=2)
+    engine = SimulationEngine(sample_data, features=features)
+    seen = []
+    engine.run(lambda eng: seen.append(eng.features.ofi))
+
+    # Limit orders alternate bid/ask with size 100
+    assert seen == [100, 0, 100, 0, 100]
+    assert engine.features.realized_volatility == 0.0
+
+def test_engine_transient_impact(sample_data):
+    model = PropagatorModel(PropagatorParams(kernel='exponential', amplitude=0.01, timescale=1.0))
+    engine = SimulationEngine(sample_data, transient_impact=model)
+
+    def buy_twice(eng):
+        if eng.current_time in (1.0, 2.0):
+            eng.submit_order(side=1, size=10, order_type='MARKET')
+
+    engine.run(buy_twice)
+
+    # The first fill moves the price by 0.01 * 10 = 0.1, decayed over one second
+    assert engine.trades[0].price == 100.0
+    assert np.isclose(engine.trades[1].price, 100.0 + 0.1 * np.exp(-1.0))
+
+def test_engine_accepts_impact_surface(sample_data):
+    surface = ImpactSurface(AlmgrenChrissModel(ImpactParams(eta=1.0, gamma=0.0, alpha=0.5)))
+    engine = SimulationEngine(sample_data, impact_model=surface)
+
+    def one_shot_strategy(eng):
+        if eng.current_time == 1.0:
+            eng.submit_order(side=1, size=16, order_type='MARKET')
+
+    engine.run(one_shot_strategy)
+    # Impact = eta * sqrt(16) * 0.01 = 0.04
+    assert np.isclose(engine.trades[0].price, 100.04)
+
+def test_replay_blocks_and_open_orders(sample_data, monkeypatch):
+
+    def strategy(eng):
+        if eng.current_time == 1.0:
+            eng.submit_order(side=1, size=5, order_type='LIMIT', price=100.0)
+            eng.submit_order(side=-1, size=5, order_type='LIMIT', price=101.0)
+        if eng.current_time == 3.0:
+            eng.submit_order(side=1, size=10, order_type='MARKET')
+
+    runs = []
+    for block in (engine_module.REPLAY_BLOCK, 2):
+        monkeypatch.setattr(engine_module, 'REPLAY_BLOCK', block)
+        engine = SimulationEngine(sample_data)
+        engine.run(strategy)
+        runs.append([(t.timestamp, t.price, t.size, t.side) for t in engine.trades])
+
+    assert runs[0] == runs[1] == [(2.0, 100.0, 5, 1), (4.0, 100.0, 10, 1)]
+    # Filled orders leave the open list; the unfilled sell stays resting
+    assert [o.side for o in engine._open_orders] == [-1]
+    assert len(engine.active_orders) == 3